@@ -1,12 +1,14 @@
+import array
 import asyncio
 import aiohttp
+import gc
+import orjson
 import time
-import statistics
-import psutil
-import json
-from decimal import Decimal
-import random
-from typing import List, Dict
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 import sys
 import os
 
@@ -14,89 +16,313 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.core.matching_engine import MatchingEngine
-from src.core.order import OrderSide, OrderType
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+ORDER_SIDES = ('buy', 'sell')
+
+# Report layout, filled per benchmark phase with str.format_map
+REPORT_HEADER = f"""{"=" * 60}
+CRYPTOCURRENCY MATCHING ENGINE PERFORMANCE REPORT
+{"=" * 60}"""
+
+REPORT_FOOTER = "\n" + "=" * 60
+
+THROUGHPUT_TMPL = """
+📊 API THROUGHPUT BENCHMARK
+------------------------------
+Total Orders:           {total_orders:,}
+Successful Orders:      {successful_orders:,}
+Failed Orders:          {failed_orders:,}
+Success Rate:           {success_rate:.2f}%
+Duration:               {total_duration:.2f} seconds
+Orders per Second:      {orders_per_second:.2f}
+Average Latency:        {avg_latency_ms:.2f} ms
+Median Latency:         {median_latency_ms:.2f} ms
+95th Percentile:        {p95_latency_ms:.2f} ms
+99th Percentile:        {p99_latency_ms:.2f} ms
+Min Latency:            {min_latency_ms:.2f} ms
+Max Latency:            {max_latency_ms:.2f} ms"""
+
+DIRECT_ENGINE_TMPL = """
+⚡ DIRECT ENGINE BENCHMARK
+------------------------------
+Total Orders:           {total_orders:,}
+Successful Orders:      {successful_orders:,}
+Duration:               {total_duration:.2f} seconds
+Orders per Second:      {orders_per_second:.2f}
+Average Latency:        {avg_latency_us:.2f} μs
+Median Latency:         {median_latency_us:.2f} μs
+95th Percentile:        {p95_latency_us:.2f} μs
+99th Percentile:        {p99_latency_us:.2f} μs
+Memory Usage:           {memory_usage_mb:.2f} MB"""
+
+DIRECT_ENGINE_PARALLEL_TMPL = """
+🧵 PARALLEL DIRECT ENGINE BENCHMARK
+------------------------------
+Worker Processes:       {workers}
+Total Orders:           {total_orders:,}
+Successful Orders:      {successful_orders:,}
+Duration:               {total_duration:.2f} seconds
+Orders per Second:      {orders_per_second:.2f}
+Average Latency:        {avg_latency_us:.2f} μs
+Median Latency:         {median_latency_us:.2f} μs
+95th Percentile:        {p95_latency_us:.2f} μs
+99th Percentile:        {p99_latency_us:.2f} μs"""
+
+BBO_UPDATES_TMPL = """
+📈 BBO UPDATE BENCHMARK
+------------------------------
+Total Requests:         {total_requests:,}
+Duration:               {total_duration:.2f} seconds
+Requests per Second:    {requests_per_second:.2f}
+Average Latency:        {avg_latency_ms:.2f} ms
+Median Latency:         {median_latency_ms:.2f} ms
+95th Percentile:        {p95_latency_ms:.2f} ms
+99th Percentile:        {p99_latency_ms:.2f} ms"""
+
+REPORT_SECTIONS = (
+    ('throughput', THROUGHPUT_TMPL),
+    ('direct_engine', DIRECT_ENGINE_TMPL),
+    ('direct_engine_parallel', DIRECT_ENGINE_PARALLEL_TMPL),
+    ('bbo_updates', BBO_UPDATES_TMPL),
+)
+
+def generate_order_fields(num_orders: int, seed: int = 42):
+    """
+    Vectorised generation of alternating buy/sell limit order fields.
+    Returns (is_sell, prices, quantities) as NumPy arrays.
+    """
+    rng = np.random.default_rng(seed)
+    is_sell = np.arange(num_orders) % 2
+    prices = 50000 + is_sell * 100 + rng.integers(-100, 101, num_orders)
+    quantities = np.round(rng.uniform(0.1, 2.0, num_orders), 3)
+    return is_sell, prices, quantities
+
+# Untimed orders run through each direct engine before its measured run
+DIRECT_WARMUP_ORDERS = 50
+
+NS_PER_MS = 1_000_000
+NS_PER_US = 1_000
+NS_PER_S = 1_000_000_000
+
+def summarize_latencies(latencies_ns, unit_ns: int) -> Dict[str, float]:
+    """
+    Order statistics of an int64 nanosecond latency sample from a single
+    vectorised pass, reported in units of unit_ns (e.g. NS_PER_MS).
+    Percentiles use linear interpolation between closest ranks; min and max
+    are the 0th and 100th percentiles of the same partition.
+    """
+    if len(latencies_ns) == 0:
+        return {'avg': 0, 'median': 0, 'p95': 0, 'p99': 0, 'min': 0, 'max': 0}
+    sample = np.asarray(latencies_ns, dtype=np.int64)
+    low, p50, p95, p99, high = (
+        np.percentile(sample, [0, 50, 95, 99, 100]) / unit_ns
+    ).tolist()
+    return {
+        'avg': float(sample.mean()) / unit_ns,
+        'median': p50,
+        'p95': p95,
+        'p99': p99,
+        'min': low,
+        'max': high
+    }
+
+def generate_order_requests(num_orders: int, seed: int = 42) -> List[Dict]:
+    """Materialize limit order requests from the generated field arrays"""
+    is_sell, prices, quantities = generate_order_fields(num_orders, seed)
+    return [
+        {
+            'symbol': 'BTC-USDT',
+            'side': ORDER_SIDES[sell],
+            'order_type': 'limit',
+            'quantity': quantity,
+            'price': price
+        }
+        for sell, price, quantity in zip(
+            is_sell.tolist(), prices.astype(str).tolist(), quantities.astype(str).tolist()
+        )
+    ]
+
+def generate_order_payloads(num_orders: int, seed: int = 42) -> List[bytes]:
+    """Build the pre-serialized JSON bodies for the throughput benchmark once"""
+    return [orjson.dumps(order) for order in generate_order_requests(num_orders, seed)]
+
+def generate_order_columns(num_orders: int, seed: int = 42) -> Tuple[List[str], List[str], List[str]]:
+    """Generated (sides, prices, quantities) as flat string lists for direct engine submission"""
+    is_sell, prices, quantities = generate_order_fields(num_orders, seed)
+    sides = [ORDER_SIDES[sell] for sell in is_sell.tolist()]
+    return sides, prices.astype(str).tolist(), quantities.astype(str).tolist()
+
+async def submit_orders_timed(engine: MatchingEngine, sides: List[str], prices: List[str],
+                              quantities: List[str], latencies_ns) -> int:
+    """
+    Submit orders to the engine one at a time, writing each round trip in
+    nanoseconds into latencies_ns. Returns the number of successful orders.
+    """
+    # Single request dict reused for every submission; the engine only reads it
+    order_request = {
+        'symbol': 'BTC-USDT',
+        'side': '',
+        'order_type': 'limit',
+        'quantity': '',
+        'price': ''
+    }
+    successful_orders = 0
+    
+    # Keep GC pauses out of the tail latencies
+    gc.disable()
+    try:
+        for i, (side, price, quantity) in enumerate(zip(sides, prices, quantities)):
+            order_request['side'] = side
+            order_request['price'] = price
+            order_request['quantity'] = quantity
+            order_start = time.perf_counter_ns()
+            
+            result = await engine.submit_order(order_request)
+            latencies_ns[i] = time.perf_counter_ns() - order_start
+            if result.get('status') == 'success':
+                successful_orders += 1
+    finally:
+        gc.enable()
+    
+    return successful_orders
+
+def _direct_engine_worker(shm_name: str, offset: int, count: int, seed: int) -> Tuple[int, int]:
+    """Process pool entry point: run an isolated engine, return (successful orders, duration ns)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        latencies_ns = np.ndarray((count,), dtype=np.int64, buffer=shm.buf, offset=offset * 8)
+        sides, prices, quantities = generate_order_columns(count, seed)
+        successful_orders, duration_ns = asyncio.run(
+            _run_warm_engine(sides, prices, quantities, latencies_ns)
+        )
+        
+        # Release the view before closing the shared buffer
+        del latencies_ns
+        return successful_orders, duration_ns
+    finally:
+        shm.close()
+
+async def _run_warm_engine(sides: List[str], prices: List[str], quantities: List[str],
+                           latencies_ns) -> Tuple[int, int]:
+    """
+    Warm up a fresh engine the same way the single-process benchmark does, then
+    time the real orders. Returns (successful orders, duration ns).
+    """
+    engine = MatchingEngine()
+    warmup_columns = generate_order_columns(DIRECT_WARMUP_ORDERS, seed=7)
+    await submit_orders_timed(engine, *warmup_columns, np.zeros(DIRECT_WARMUP_ORDERS, dtype=np.int64))
+    
+    start_ns = time.perf_counter_ns()
+    successful_orders = await submit_orders_timed(engine, sides, prices, quantities, latencies_ns)
+    return successful_orders, time.perf_counter_ns() - start_ns
+
+def _worker_ready() -> int:
+    """No-op task that makes the pool start its worker processes before timing"""
+    return os.getpid()
 
 class PerformanceBenchmark:
-    def __init__(self, rest_url="http://localhost:8000"):
+    def __init__(self, rest_url="http://localhost:8000", max_connections: int = 512, capture_bodies: bool = False):
         self.rest_url = rest_url
+        self.max_connections = max_connections
+        # Only decode response bodies when debugging; timed runs just drain them
+        self.capture_bodies = capture_bodies
         self.session = None
         self.results = {}
         
+        # Prebuilt endpoint URLs so the request loops avoid per-call formatting
+        self._orders_url = f"{rest_url}/api/v1/orders"
+        self._bbo_url = f"{rest_url}/api/v1/bbo/BTC-USDT"
+        
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Keep-alive connection pool shared by every benchmark phase
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
-    async def submit_order_with_timing(self, order_data):
-        """Submit order and measure response time"""
-        start_time = time.perf_counter()
+    async def submit_order_with_timing(self, payload: bytes):
+        """Submit a pre-serialized order and measure response time"""
+        start_ns = time.perf_counter_ns()
         
         try:
-            async with self.session.post(f"{self.rest_url}/api/v1/orders", json=order_data) as response:
-                result = await response.json()
-                end_time = time.perf_counter()
+            async with self.session.post(self._orders_url, data=payload, headers=JSON_HEADERS) as response:
+                body = await response.read()
+                end_ns = time.perf_counter_ns()
                 
                 return {
                     'success': response.status == 200,
-                    'latency': (end_time - start_time) * 1000,  # Convert to milliseconds
-                    'result': result
+                    'latency_ns': end_ns - start_ns,
+                    'result': orjson.loads(body) if self.capture_bodies else None
                 }
         except Exception as e:
-            end_time = time.perf_counter()
+            end_ns = time.perf_counter_ns()
             return {
                 'success': False,
-                'latency': (end_time - start_time) * 1000,
+                'latency_ns': end_ns - start_ns,
                 'error': str(e)
             }
     
+    async def _warmup(self, num_orders: int = 100):
+        """
+        Prime the connection pool, server code paths and client inline caches
+        with throwaway orders and one BBO request; results are discarded.
+        """
+        payloads = generate_order_payloads(num_orders, seed=7)
+        await asyncio.gather(*[self.submit_order_with_timing(payload) for payload in payloads])
+        await self.fetch_bbo_with_timing()
+    
+    async def _warmup_bbo(self, num_requests: int = 100):
+        """
+        Prime the connection pool and the BBO endpoint with read-only requests,
+        leaving the order book the benchmark measures unchanged.
+        """
+        await asyncio.gather(*[self.fetch_bbo_with_timing() for _ in range(num_requests)])
+    
     async def benchmark_order_throughput(self, num_orders: int = 1000, concurrent_limit: int = 100):
         """Benchmark order submission throughput"""
         print(f"Benchmarking order throughput: {num_orders} orders, {concurrent_limit} concurrent")
         
-        # Generate test orders
-        orders = []
-        for i in range(num_orders):
-            side = 'buy' if i % 2 == 0 else 'sell'
-            base_price = 50000 if side == 'buy' else 50100
-            price = base_price + random.randint(-100, 100)
-            
-            order = {
-                'symbol': 'BTC-USDT',
-                'side': side,
-                'order_type': 'limit',
-                'quantity': str(round(random.uniform(0.1, 2.0), 3)),
-                'price': str(price)
-            }
-            orders.append(order)
+        # Generate and serialize test orders up front
+        orders = generate_order_payloads(num_orders)
+        await self._warmup(max(100, concurrent_limit))
         
-        # Process orders in batches
-        latencies = []
+        # Keep a steady concurrent_limit requests in flight, recording int64 nanosecond latencies
+        semaphore = asyncio.Semaphore(concurrent_limit)
+        latencies_ns = array.array('q', [0]) * num_orders
         successful_orders = 0
-        failed_orders = 0
         
-        start_time = time.perf_counter()
+        async def submit_bounded(payload: bytes):
+            async with semaphore:
+                return await self.submit_order_with_timing(payload)
         
-        for i in range(0, len(orders), concurrent_limit):
-            batch = orders[i:i + concurrent_limit]
-            tasks = [self.submit_order_with_timing(order) for order in batch]
-            
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, dict):
-                    latencies.append(result['latency'])
-                    if result['success']:
-                        successful_orders += 1
-                    else:
-                        failed_orders += 1
-                else:
-                    failed_orders += 1
-        
-        end_time = time.perf_counter()
-        total_duration = end_time - start_time
+        start_ns = time.perf_counter_ns()
+        
+        # submit_order_with_timing never raises, so every result is a dict
+        results = await asyncio.gather(*[submit_bounded(order) for order in orders])
+        
+        for idx, result in enumerate(results):
+            latencies_ns[idx] = result['latency_ns']
+            successful_orders += result['success']
+        failed_orders = num_orders - successful_orders
+        
+        total_duration = (time.perf_counter_ns() - start_ns) / NS_PER_S
+        
+        # Zero-copy view over the recorded samples
+        summary = summarize_latencies(np.frombuffer(latencies_ns, dtype=np.int64), NS_PER_MS)
         
         self.results['throughput'] = {
             'total_orders': num_orders,
@@ -104,115 +330,158 @@ class PerformanceBenchmark:
             'failed_orders': failed_orders,
             'total_duration': total_duration,
             'orders_per_second': successful_orders / total_duration,
-            'avg_latency_ms': statistics.mean(latencies) if latencies else 0,
-            'median_latency_ms': statistics.median(latencies) if latencies else 0,
-            'p95_latency_ms': self.percentile(latencies, 95) if latencies else 0,
-            'p99_latency_ms': self.percentile(latencies, 99) if latencies else 0,
-            'min_latency_ms': min(latencies) if latencies else 0,
-            'max_latency_ms': max(latencies) if latencies else 0
+            'avg_latency_ms': summary['avg'],
+            'median_latency_ms': summary['median'],
+            'p95_latency_ms': summary['p95'],
+            'p99_latency_ms': summary['p99'],
+            'min_latency_ms': summary['min'],
+            'max_latency_ms': summary['max']
         }
         
         return self.results['throughput']
     
-    def benchmark_matching_engine_direct(self, num_orders: int = 10000):
+    async def benchmark_matching_engine_direct(self, num_orders: int = 10000):
         """Benchmark matching engine directly (without API overhead)"""
         print(f"Benchmarking matching engine directly: {num_orders} orders")
         
         engine = MatchingEngine()
+        sides, prices, quantities = generate_order_columns(num_orders)
+        latencies_ns = np.zeros(num_orders, dtype=np.int64)
         
-        # Generate test orders
-        orders = []
-        for i in range(num_orders):
-            side = OrderSide.BUY if i % 2 == 0 else OrderSide.SELL
-            base_price = Decimal('50000') if side == OrderSide.BUY else Decimal('50100')
-            price = base_price + Decimal(str(random.randint(-100, 100)))
-            
-            order_request = {
-                'symbol': 'BTC-USDT',
-                'side': side.value,
-                'order_type': 'limit',
-                'quantity': str(round(random.uniform(0.1, 2.0), 3)),
-                'price': str(price)
-            }
-            orders.append(order_request)
+        # Warm up the engine's order book and lookup paths before timing
+        warmup_columns = generate_order_columns(DIRECT_WARMUP_ORDERS, seed=7)
+        await submit_orders_timed(engine, *warmup_columns, np.zeros(DIRECT_WARMUP_ORDERS, dtype=np.int64))
         
-        # Measure memory before
+        # Measure memory before; psutil is only needed by this phase
+        import psutil
         process = psutil.Process()
         memory_before = process.memory_info().rss / 1024 / 1024  # MB
         
-        # Process orders and measure time
-        latencies = []
-        successful_orders = 0
-        
-        start_time = time.perf_counter()
-        
-        for order_request in orders:
-            order_start = time.perf_counter()
-            
-            try:
-                result = asyncio.run(engine.submit_order(order_request))
-                order_end = time.perf_counter()
-                
-                latencies.append((order_end - order_start) * 1000000)  # microseconds
-                if result.get('status') == 'success':
-                    successful_orders += 1
-            except Exception as e:
-                print(f"Order failed: {e}")
-        
-        end_time = time.perf_counter()
-        total_duration = end_time - start_time
+        # Process orders and measure time on the already running event loop
+        start_ns = time.perf_counter_ns()
+        successful_orders = await submit_orders_timed(engine, sides, prices, quantities, latencies_ns)
+        total_duration = (time.perf_counter_ns() - start_ns) / NS_PER_S
         
         # Measure memory after
         memory_after = process.memory_info().rss / 1024 / 1024  # MB
+        summary = summarize_latencies(latencies_ns, NS_PER_US)
         
         self.results['direct_engine'] = {
             'total_orders': num_orders,
             'successful_orders': successful_orders,
             'total_duration': total_duration,
             'orders_per_second': successful_orders / total_duration,
-            'avg_latency_us': statistics.mean(latencies) if latencies else 0,
-            'median_latency_us': statistics.median(latencies) if latencies else 0,
-            'p95_latency_us': self.percentile(latencies, 95) if latencies else 0,
-            'p99_latency_us': self.percentile(latencies, 99) if latencies else 0,
-            'min_latency_us': min(latencies) if latencies else 0,
-            'max_latency_us': max(latencies) if latencies else 0,
+            'avg_latency_us': summary['avg'],
+            'median_latency_us': summary['median'],
+            'p95_latency_us': summary['p95'],
+            'p99_latency_us': summary['p99'],
+            'min_latency_us': summary['min'],
+            'max_latency_us': summary['max'],
             'memory_usage_mb': memory_after - memory_before
         }
         
         return self.results['direct_engine']
     
-    async def benchmark_bbo_updates(self, num_updates: int = 1000):
-        """Benchmark BBO calculation speed"""
-        print(f"Benchmarking BBO updates: {num_updates} requests")
+    async def benchmark_matching_engine_direct_parallel(self, num_orders: int = 10000, workers: Optional[int] = None):
+        """
+        Benchmark isolated matching engines in parallel worker processes.
+        Each worker owns its own MatchingEngine and writes its latencies into
+        a slice of one shared int64 buffer, so nothing is pickled back.
+        """
+        workers = workers or os.cpu_count() or 1
+        print(f"Benchmarking matching engine across {workers} processes: {num_orders} orders")
+        
+        base, extra = divmod(num_orders, workers)
+        counts = [base + (1 if i < extra else 0) for i in range(workers)]
+        offsets = np.cumsum([0] + counts[:-1]).tolist()
+        
+        shm = shared_memory.SharedMemory(create=True, size=max(num_orders, 1) * 8)
+        try:
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Spawn every worker and finish its imports up front, so process
+                # start-up does not overlap another worker's timed run
+                await asyncio.gather(*[loop.run_in_executor(pool, _worker_ready) for _ in range(workers)])
+                outcomes = await asyncio.gather(*[
+                    loop.run_in_executor(pool, _direct_engine_worker, shm.name, offset, count, 42 + i)
+                    for i, (offset, count) in enumerate(zip(offsets, counts))
+                ])
+            latencies_ns = np.ndarray((num_orders,), dtype=np.int64, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        successful_orders = sum(successful for successful, _ in outcomes)
+        # Workers run concurrently, so the slowest one bounds the wall time
+        total_duration = max(duration_ns for _, duration_ns in outcomes) / NS_PER_S
+        summary = summarize_latencies(latencies_ns, NS_PER_US)
+        
+        self.results['direct_engine_parallel'] = {
+            'workers': workers,
+            'total_orders': num_orders,
+            'successful_orders': successful_orders,
+            'total_duration': total_duration,
+            'orders_per_second': successful_orders / total_duration,
+            'avg_latency_us': summary['avg'],
+            'median_latency_us': summary['median'],
+            'p95_latency_us': summary['p95'],
+            'p99_latency_us': summary['p99'],
+            'min_latency_us': summary['min'],
+            'max_latency_us': summary['max']
+        }
         
-        # First, populate the order book
+        return self.results['direct_engine_parallel']
+    
+    async def fetch_bbo_with_timing(self) -> Optional[int]:
+        """Fetch the BBO once and return the round trip in nanoseconds (None on failure)"""
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            async with self.session.get(self._bbo_url) as response:
+                body = await response.read()
+                latency_ns = time.perf_counter_ns() - start_ns
+                if self.capture_bodies:
+                    orjson.loads(body)
+                return latency_ns
+        except Exception as e:
+            print(f"BBO request failed: {e}")
+            return None
+    
+    async def benchmark_bbo_updates(self, num_updates: int = 1000, concurrent_limit: int = 64):
+        """
+        Benchmark BBO calculation speed.
+        Probes are pipelined with up to concurrent_limit in flight; pass
+        concurrent_limit=1 for a serial per-request latency profile.
+        """
+        print(f"Benchmarking BBO updates: {num_updates} requests, {concurrent_limit} concurrent")
+        
+        # First, populate the order book; the warm-up only reads it, so the
+        # measured book is exactly the populated one
         await self.populate_order_book()
+        await self._warmup_bbo()
         
-        latencies = []
-        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrent_limit)
         
-        for _ in range(num_updates):
-            bbo_start = time.perf_counter()
-            
-            try:
-                async with self.session.get(f"{self.rest_url}/api/v1/bbo/BTC-USDT") as response:
-                    await response.json()
-                    bbo_end = time.perf_counter()
-                    latencies.append((bbo_end - bbo_start) * 1000)  # milliseconds
-            except Exception as e:
-                print(f"BBO request failed: {e}")
+        async def fetch_bounded():
+            async with semaphore:
+                return await self.fetch_bbo_with_timing()
+        
+        start_ns = time.perf_counter_ns()
         
-        end_time = time.perf_counter()
-        total_duration = end_time - start_time
+        results = await asyncio.gather(*[fetch_bounded() for _ in range(num_updates)])
+        latencies_ns = [latency for latency in results if latency is not None]
+        
+        total_duration = (time.perf_counter_ns() - start_ns) / NS_PER_S
+        summary = summarize_latencies(latencies_ns, NS_PER_MS)
         
         self.results['bbo_updates'] = {
             'total_requests': num_updates,
             'total_duration': total_duration,
             'requests_per_second': num_updates / total_duration,
-            'avg_latency_ms': statistics.mean(latencies) if latencies else 0,
-            'median_latency_ms': statistics.median(latencies) if latencies else 0,
-            'p95_latency_ms': self.percentile(latencies, 95) if latencies else 0,
-            'p99_latency_ms': self.percentile(latencies, 99) if latencies else 0
+            'avg_latency_ms': summary['avg'],
+            'median_latency_ms': summary['median'],
+            'p95_latency_ms': summary['p95'],
+            'p99_latency_ms': summary['p99']
         }
         
         return self.results['bbo_updates']
@@ -231,7 +500,7 @@ class PerformanceBenchmark:
                 'quantity': '1.0',
                 'price': str(price)
             }
-            tasks.append(self.submit_order_with_timing(order))
+            tasks.append(self.submit_order_with_timing(orjson.dumps(order)))
         
         # Add sell orders
         for i in range(num_levels):
@@ -243,93 +512,38 @@ class PerformanceBenchmark:
                 'quantity': '1.0',
                 'price': str(price)
             }
-            tasks.append(self.submit_order_with_timing(order))
+            tasks.append(self.submit_order_with_timing(orjson.dumps(order)))
         
         await asyncio.gather(*tasks)
     
-    @staticmethod
-    def percentile(data: List[float], p: float) -> float:
-        """Calculate percentile of data"""
-        if not data:
-            return 0
-        sorted_data = sorted(data)
-        index = (len(sorted_data) - 1) * p / 100
-        lower = int(index)
-        upper = lower + 1
-        weight = index - lower
-        
-        if upper >= len(sorted_data):
-            return sorted_data[-1]
-        
-        return sorted_data[lower] * (1 - weight) + sorted_data[upper] * weight
-    
     def generate_report(self):
         """Generate performance report"""
-        report = []
-        report.append("=" * 60)
-        report.append("CRYPTOCURRENCY MATCHING ENGINE PERFORMANCE REPORT")
-        report.append("=" * 60)
-        
-        if 'throughput' in self.results:
-            data = self.results['throughput']
-            report.append("\n📊 API THROUGHPUT BENCHMARK")
-            report.append("-" * 30)
-            report.append(f"Total Orders:           {data['total_orders']:,}")
-            report.append(f"Successful Orders:      {data['successful_orders']:,}")
-            report.append(f"Failed Orders:          {data['failed_orders']:,}")
-            report.append(f"Success Rate:           {data['successful_orders']/data['total_orders']*100:.2f}%")
-            report.append(f"Duration:               {data['total_duration']:.2f} seconds")
-            report.append(f"Orders per Second:      {data['orders_per_second']:.2f}")
-            report.append(f"Average Latency:        {data['avg_latency_ms']:.2f} ms")
-            report.append(f"Median Latency:         {data['median_latency_ms']:.2f} ms")
-            report.append(f"95th Percentile:        {data['p95_latency_ms']:.2f} ms")
-            report.append(f"99th Percentile:        {data['p99_latency_ms']:.2f} ms")
-            report.append(f"Min Latency:            {data['min_latency_ms']:.2f} ms")
-            report.append(f"Max Latency:            {data['max_latency_ms']:.2f} ms")
-        
-        if 'direct_engine' in self.results:
-            data = self.results['direct_engine']
-            report.append("\n⚡ DIRECT ENGINE BENCHMARK")
-            report.append("-" * 30)
-            report.append(f"Total Orders:           {data['total_orders']:,}")
-            report.append(f"Successful Orders:      {data['successful_orders']:,}")
-            report.append(f"Duration:               {data['total_duration']:.2f} seconds")
-            report.append(f"Orders per Second:      {data['orders_per_second']:.2f}")
-            report.append(f"Average Latency:        {data['avg_latency_us']:.2f} μs")
-            report.append(f"Median Latency:         {data['median_latency_us']:.2f} μs")
-            report.append(f"95th Percentile:        {data['p95_latency_us']:.2f} μs")
-            report.append(f"99th Percentile:        {data['p99_latency_us']:.2f} μs")
-            report.append(f"Memory Usage:           {data['memory_usage_mb']:.2f} MB")
-        
-        if 'bbo_updates' in self.results:
-            data = self.results['bbo_updates']
-            report.append("\n📈 BBO UPDATE BENCHMARK")
-            report.append("-" * 30)
-            report.append(f"Total Requests:         {data['total_requests']:,}")
-            report.append(f"Duration:               {data['total_duration']:.2f} seconds")
-            report.append(f"Requests per Second:    {data['requests_per_second']:.2f}")
-            report.append(f"Average Latency:        {data['avg_latency_ms']:.2f} ms")
-            report.append(f"Median Latency:         {data['median_latency_ms']:.2f} ms")
-            report.append(f"95th Percentile:        {data['p95_latency_ms']:.2f} ms")
-            report.append(f"99th Percentile:        {data['p99_latency_ms']:.2f} ms")
-        
-        report.append("\n" + "=" * 60)
-        
-        return "\n".join(report)
+        sections = [REPORT_HEADER]
+        for key, template in REPORT_SECTIONS:
+            if key in self.results:
+                data = self.results[key]
+                if key == 'throughput':
+                    data = {**data, 'success_rate': data['successful_orders'] / data['total_orders'] * 100}
+                sections.append(template.format_map(data))
+        sections.append(REPORT_FOOTER)
+        
+        return "\n".join(sections)
     
     def save_report(self, filename: str = "performance_report.txt"):
         """Save performance report to file"""
-        report = self.generate_report()
-        with open(filename, 'w') as f:
-            f.write(report)
-        
-        # Also save raw data as JSON
-        json_filename = filename.replace('.txt', '.json')
-        with open(json_filename, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        report_path = Path(filename)
+        report_path.write_text(self.generate_report(), encoding='utf-8')
+        
+        # Also save raw data as JSON; NumPy scalars/arrays serialize natively
+        report_path.with_suffix('.json').write_bytes(
+            orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
 
-async def main():
-    """Run comprehensive performance benchmark"""
+async def main(parallel: bool = False):
+    """
+    Run comprehensive performance benchmark.
+    parallel: also run the multi-process direct engine phase
+    """
     print("Starting Comprehensive Performance Benchmark")
     print("=" * 50)
     
@@ -341,7 +555,9 @@ async def main():
             
             # Test direct engine performance
             print("\n2. Testing direct engine performance...")
-            benchmark.benchmark_matching_engine_direct(num_orders=5000)
+            await benchmark.benchmark_matching_engine_direct(num_orders=5000)
+            if parallel:
+                await benchmark.benchmark_matching_engine_direct_parallel(num_orders=20000)
             
             # Test BBO update speed
             print("\n3. Testing BBO update speed...")
@@ -361,10 +577,28 @@ async def main():
             traceback.print_exc()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Matching engine performance benchmark")
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        default=os.environ.get("BENCHMARK_PARALLEL", "").lower() in ("1", "true", "yes"),
+        help="also run the multi-process direct engine phase (or set BENCHMARK_PARALLEL=1)"
+    )
+    args = parser.parse_args()
+    
     print("Make sure the matching engine is running on http://localhost:8000")
     print("Press Ctrl+C to stop the benchmark\n")
     
+    # uvloop ships with uvicorn[standard]; fall back to the default loop where it
+    # is unavailable (e.g. Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
-        asyncio.run(main())
+        asyncio.run(main(parallel=args.parallel))
     except KeyboardInterrupt:
         print("\nBenchmark stopped by user")
\ No newline at end of file
@@ -1,53 +1,119 @@
 import os
+import sys
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import FrozenSet, List, Optional
 
+from src.core.order import PRICE_SCALE
+
+def _env_str(name: str, default: str):
+    return field(default_factory=lambda: os.getenv(name, default))
+
+def _env_int(name: str, default: int):
+    return field(default_factory=lambda: int(os.getenv(name, default)))
+
+def _env_decimal(name: str, default: str):
+    return field(default_factory=lambda: Decimal(os.getenv(name, default)))
+
+def _env_bool(name: str, default: str):
+    return field(default_factory=lambda: os.getenv(name, default).lower() == 'true')
+
+# Fixed-point scale for fee rates, the same 1e-8 resolution as prices
+FEE_RATE_SCALE = PRICE_SCALE
+
+def _to_fee_units(rate: Decimal) -> Optional[int]:
+    """Fee rate as an integer at FEE_RATE_SCALE, or None if it is finer than 1e-8"""
+    if not rate.is_finite():
+        return None
+    units = rate * FEE_RATE_SCALE
+    if units != units.to_integral_value():
+        return None
+    return int(units)
+
+@dataclass(frozen=True, slots=True)
 class Config:
+    """
+    Immutable snapshot of the engine configuration.
+    Environment variables are read once, when the instance is created.
+    """
     # API Configuration
-    REST_HOST = os.getenv('REST_HOST', '0.0.0.0')
-    REST_PORT = int(os.getenv('REST_PORT', 8000))
-    
-    WEBSOCKET_HOST = os.getenv('WEBSOCKET_HOST', '0.0.0.0')
-    WEBSOCKET_PORT = int(os.getenv('WEBSOCKET_PORT', 8001))
-    
+    REST_HOST: str = _env_str('REST_HOST', '0.0.0.0')
+    REST_PORT: int = _env_int('REST_PORT', 8000)
+
+    WEBSOCKET_HOST: str = _env_str('WEBSOCKET_HOST', '0.0.0.0')
+    WEBSOCKET_PORT: int = _env_int('WEBSOCKET_PORT', 8001)
+
     # Matching Engine Configuration
-    MAX_ORDERS_PER_SECOND = int(os.getenv('MAX_ORDERS_PER_SECOND', 10000))
-    MAX_ORDER_BOOK_DEPTH = int(os.getenv('MAX_ORDER_BOOK_DEPTH', 1000))
-    
+    MAX_ORDERS_PER_SECOND: int = _env_int('MAX_ORDERS_PER_SECOND', 10000)
+    MAX_ORDER_BOOK_DEPTH: int = _env_int('MAX_ORDER_BOOK_DEPTH', 1000)
+
     # Performance Configuration
-    ORDER_BOOK_DEPTH_LEVELS = int(os.getenv('ORDER_BOOK_DEPTH_LEVELS', 10))
-    RECENT_TRADES_LIMIT = int(os.getenv('RECENT_TRADES_LIMIT', 100))
-    
+    ORDER_BOOK_DEPTH_LEVELS: int = _env_int('ORDER_BOOK_DEPTH_LEVELS', 10)
+    RECENT_TRADES_LIMIT: int = _env_int('RECENT_TRADES_LIMIT', 100)
+
     # Fee Configuration (for bonus features)
-    MAKER_FEE_RATE = Decimal(os.getenv('MAKER_FEE_RATE', '0.001'))  # 0.1%
-    TAKER_FEE_RATE = Decimal(os.getenv('TAKER_FEE_RATE', '0.002'))  # 0.2%
-    
+    MAKER_FEE_RATE: Decimal = _env_decimal('MAKER_FEE_RATE', '0.001')  # 0.1%
+    TAKER_FEE_RATE: Decimal = _env_decimal('TAKER_FEE_RATE', '0.002')  # 0.2%
+    # Same rates as integers for fixed-point fee math:
+    # fee = notional_scaled * FEE_UNITS // FEE_RATE_SCALE
+    # None only when the rate has more than 8 decimal places; validate()
+    # reports that at startup instead of failing at import
+    MAKER_FEE_UNITS: Optional[int] = field(init=False)
+    TAKER_FEE_UNITS: Optional[int] = field(init=False)
+
     # Logging Configuration
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE = os.getenv('LOG_FILE', 'matching_engine.log')
-    
+    LOG_LEVEL: str = _env_str('LOG_LEVEL', 'INFO')
+    LOG_FILE: str = _env_str('LOG_FILE', 'matching_engine.log')
+
     # Database Configuration (for persistence bonus)
-    DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///matching_engine.db')
-    
+    DATABASE_URL: str = _env_str('DATABASE_URL', 'sqlite:///matching_engine.db')
+
     # Supported Trading Pairs
-    SUPPORTED_SYMBOLS = [
-        'BTC-USDT', 'ETH-USDT', 'BNB-USDT', 'ADA-USDT', 
+    # Interned so membership checks and symbol-keyed dict lookups can short-circuit
+    # on identity; callers should sys.intern() incoming symbols once at the API boundary
+    SUPPORTED_SYMBOLS: FrozenSet[str] = frozenset(sys.intern(symbol) for symbol in (
+        'BTC-USDT', 'ETH-USDT', 'BNB-USDT', 'ADA-USDT',
         'DOT-USDT', 'XRP-USDT', 'LTC-USDT', 'LINK-USDT'
-    ]
-    
+    ))
+
     # Order Validation
-    MIN_ORDER_QUANTITY = Decimal('0.00000001')  # 1 satoshi equivalent
-    MAX_ORDER_QUANTITY = Decimal('1000000')     # 1 million
-    MIN_ORDER_PRICE = Decimal('0.00000001')
-    MAX_ORDER_PRICE = Decimal('1000000')
-    
+    MIN_ORDER_QUANTITY: Decimal = Decimal('0.00000001')  # 1 satoshi equivalent
+    MAX_ORDER_QUANTITY: Decimal = Decimal('1000000')     # 1 million
+    MIN_ORDER_PRICE: Decimal = Decimal('0.00000001')
+    MAX_ORDER_PRICE: Decimal = Decimal('1000000')
+
     # Rate Limiting
-    RATE_LIMIT_ORDERS_PER_MINUTE = int(os.getenv('RATE_LIMIT_ORDERS_PER_MINUTE', 1000))
-    RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv('RATE_LIMIT_REQUESTS_PER_MINUTE', 6000))
-    
+    RATE_LIMIT_ORDERS_PER_MINUTE: int = _env_int('RATE_LIMIT_ORDERS_PER_MINUTE', 1000)
+    RATE_LIMIT_REQUESTS_PER_MINUTE: int = _env_int('RATE_LIMIT_REQUESTS_PER_MINUTE', 6000)
+
     # WebSocket Configuration
-    MAX_WEBSOCKET_CONNECTIONS = int(os.getenv('MAX_WEBSOCKET_CONNECTIONS', 1000))
-    WEBSOCKET_HEARTBEAT_INTERVAL = int(os.getenv('WEBSOCKET_HEARTBEAT_INTERVAL', 30))
-    
+    MAX_WEBSOCKET_CONNECTIONS: int = _env_int('MAX_WEBSOCKET_CONNECTIONS', 1000)
+    WEBSOCKET_HEARTBEAT_INTERVAL: int = _env_int('WEBSOCKET_HEARTBEAT_INTERVAL', 30)
+
     # Development/Testing
-    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
-    TESTING = os.getenv('TESTING', 'False').lower() == 'true'
\ No newline at end of file
+    DEBUG: bool = _env_bool('DEBUG', 'False')
+    TESTING: bool = _env_bool('TESTING', 'False')
+
+    def __post_init__(self):
+        object.__setattr__(self, 'MAKER_FEE_UNITS', _to_fee_units(self.MAKER_FEE_RATE))
+        object.__setattr__(self, 'TAKER_FEE_UNITS', _to_fee_units(self.TAKER_FEE_RATE))
+
+    def validate(self) -> None:
+        """
+        Check settings that cannot be rejected at import without taking down
+        every module that imports CONFIG. Called by the application at startup.
+        """
+        errors: List[str] = []
+        for name, rate, units in (
+            ('MAKER_FEE_RATE', self.MAKER_FEE_RATE, self.MAKER_FEE_UNITS),
+            ('TAKER_FEE_RATE', self.TAKER_FEE_RATE, self.TAKER_FEE_UNITS)
+        ):
+            if not rate.is_finite() or rate < 0 or rate >= 1:
+                errors.append(f"{name}={rate} must be at least 0 and below 1")
+            elif units is None:
+                errors.append(f"{name}={rate} has more than 8 decimal places")
+        if errors:
+            raise ValueError("; ".join(errors))
+
+# Global configuration instance
+CONFIG = Config()
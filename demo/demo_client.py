@@ -1,11 +1,100 @@
 import asyncio
 import aiohttp
 import websockets
-import json
-import random
-from decimal import Decimal
+import numpy as np
+import os
+import sys
 import time
 
+try:
+    import orjson
+except ImportError:  # the stdlib module exposes the same dumps/loads used here
+    import json as orjson
+
+def _as_text(payload) -> str:
+    """orjson encodes to bytes; text frames and aiohttp's json= bodies need str"""
+    return payload.decode() if isinstance(payload, bytes) else payload
+
+def format_cents(cents: int) -> str:
+    """Render an integer price in cents as a decimal string, e.g. 5000000 -> '50000.00'"""
+    return f"{cents // 100}.{cents % 100:02d}"
+
+# Listeners write one status line per this many frames instead of printing each one
+LISTENER_REPORT_EVERY = 1000
+
+# Periodic listener status lines are only written with DEMO_VERBOSE=1, so
+# benchmark runs keep stdout out of the receive loop; the per-session totals are
+# always reported
+DEMO_VERBOSE = os.environ.get("DEMO_VERBOSE", "0") == "1"
+
+# Seed for the feed demo's order generator, so runs are reproducible
+DEMO_SEED = int(os.environ.get("DEMO_SEED", "42"))
+
+# Local feed listeners favour throughput over strictness: no per-message deflate
+# and no frame size cap. websockets has no switch to skip UTF-8 validation of
+# text frames, so that check remains; binary frames skip it and arrive as bytes,
+# which the listeners hand to orjson.loads as-is without decoding to str.
+WS_CONNECT_OPTIONS = {
+    'compression': None,
+    'max_size': None,
+    'max_queue': 1024,
+    'ping_interval': 20,
+    'ping_timeout': 20
+}
+
+# Serialized subscribe messages, keyed by (channel, symbol)
+_SUBSCRIBE_CACHE = {}
+
+def subscribe_message(channel: str, symbol: str) -> str:
+    """Return the subscribe frame for a channel/symbol, serializing it only once"""
+    key = (channel, symbol)
+    payload = _SUBSCRIBE_CACHE.get(key)
+    if payload is None:
+        payload = _SUBSCRIBE_CACHE[key] = _as_text(orjson.dumps({
+            "action": "subscribe",
+            "channel": channel,
+            "symbol": symbol
+        }))
+    return payload
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Pre-serialized BTC-USDT limit order; only side, quantity and price vary, so the
+# hot order loops fill these placeholders with bytes.replace instead of encoding
+# a dict per order
+LIMIT_ORDER_TEMPLATE = (
+    b'{"symbol":"BTC-USDT","side":"__S__","order_type":"limit",'
+    b'"quantity":"__Q__","price":"__P__"}'
+)
+
+def limit_order_body(side: str, quantity: str, price: str) -> bytes:
+    """Fill LIMIT_ORDER_TEMPLATE into a ready-to-post JSON body"""
+    return (LIMIT_ORDER_TEMPLATE
+            .replace(b'__S__', side.encode())
+            .replace(b'__Q__', quantity.encode())
+            .replace(b'__P__', price.encode()))
+
+def _report_orderbook(data, count):
+    sys.stdout.write(
+        f"{count} order book updates - {data['symbol']} "
+        f"bid={data.get('best_bid', 'N/A')} ask={data.get('best_ask', 'N/A')} "
+        f"spread={data.get('spread', 'N/A')}\n"
+    )
+
+def _report_trade(data, count):
+    # Trade frames carry integer price ticks / quantity lots at price_scale
+    scale = data['price_scale']
+    sys.stdout.write(
+        f"{count} trades - {data['symbol']} last {data['quantity_lots'] / scale} "
+        f"@ {data['price_ticks'] / scale} ({data['aggressor_side']}) {data['timestamp']}\n"
+    )
+
+# Listener frame routing by channel name; frames on other channels are ignored
+FRAME_HANDLERS = {
+    'orderbook': _report_orderbook,
+    'trades': _report_trade
+}
+
 class MatchingEngineDemo:
     def __init__(self, rest_url="http://localhost:8000", ws_url="ws://localhost:8001"):
         self.rest_url = rest_url
@@ -13,7 +102,18 @@ class MatchingEngineDemo:
         self.session = None
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Keep-alive pool wide enough for the concurrent order bursts
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=256,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        # aiohttp wants a str-returning serializer for json= bodies
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=lambda obj: _as_text(orjson.dumps(obj))
+        )
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -23,214 +123,190 @@ class MatchingEngineDemo:
     async def submit_order(self, order_data):
         """Submit an order via REST API"""
         async with self.session.post(f"{self.rest_url}/api/v1/orders", json=order_data) as response:
-            return await response.json()
+            return orjson.loads(await response.read())
+    
+    async def submit_order_body(self, body: bytes):
+        """Submit an already-serialized order via REST API"""
+        async with self.session.post(f"{self.rest_url}/api/v1/orders", data=body, headers=JSON_HEADERS) as response:
+            return orjson.loads(await response.read())
     
     async def get_order_book(self, symbol):
         """Get order book via REST API"""
         async with self.session.get(f"{self.rest_url}/api/v1/orderbook/{symbol}") as response:
-            return await response.json()
+            return orjson.loads(await response.read())
     
     async def get_bbo(self, symbol):
         """Get Best Bid Offer via REST API"""
         async with self.session.get(f"{self.rest_url}/api/v1/bbo/{symbol}") as response:
-            return await response.json()
+            return orjson.loads(await response.read())
     
     async def get_trades(self, symbol, limit=10):
         """Get recent trades via REST API"""
         async with self.session.get(f"{self.rest_url}/api/v1/trades/{symbol}?limit={limit}") as response:
-            return await response.json()
+            return orjson.loads(await response.read())
     
     async def listen_to_market_data(self, symbol, duration=30):
         """Listen to market data via WebSocket"""
-        uri = f"{self.ws_url}/ws/market-data"
-        
-        try:
-            async with websockets.connect(uri) as websocket:
-                # Subscribe to symbol
-                subscribe_msg = {
-                    "action": "subscribe",
-                    "channel": "orderbook",
-                    "symbol": symbol
-                }
-                await websocket.send(json.dumps(subscribe_msg))
-                
-                print(f"Listening to {symbol} market data for {duration} seconds...")
-                start_time = time.time()
-                
-                while time.time() - start_time < duration:
-                    try:
-                        message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                        data = json.loads(message)
-                        
-                        if data.get('channel') == 'orderbook':
-                            print(f"Order Book Update - {data['symbol']}")
-                            print(f"  Best Bid: {data.get('best_bid', 'N/A')}")
-                            print(f"  Best Ask: {data.get('best_ask', 'N/A')}")
-                            print(f"  Spread: {data.get('spread', 'N/A')}")
-                            print("-" * 40)
-                    except asyncio.TimeoutError:
-                        continue
-                        
-        except Exception as e:
-            print(f"WebSocket error: {e}")
+        print(f"Listening to {symbol} market data for {duration} seconds...")
+        updates = await self._listen("/ws/market-data", "orderbook", symbol, duration)
+        sys.stdout.write(f"Received {updates} {symbol} order book updates\n")
+        sys.stdout.flush()
     
     async def listen_to_trades(self, symbol, duration=30):
         """Listen to trade executions via WebSocket"""
-        uri = f"{self.ws_url}/ws/trades"
+        print(f"Listening to {symbol} trades for {duration} seconds...")
+        trades = await self._listen("/ws/trades", "trades", symbol, duration)
+        sys.stdout.write(f"Received {trades} {symbol} trades\n")
+        sys.stdout.flush()
+    
+    async def _listen(self, path, channel, symbol, duration):
+        """Subscribe to a channel and route frames until the deadline; returns the channel's frame count"""
+        uri = f"{self.ws_url}{path}"
+        counts = dict.fromkeys(FRAME_HANDLERS, 0)
         
         try:
-            async with websockets.connect(uri) as websocket:
-                # Subscribe to trades
-                subscribe_msg = {
-                    "action": "subscribe",
-                    "channel": "trades",
-                    "symbol": symbol
-                }
-                await websocket.send(json.dumps(subscribe_msg))
+            async with websockets.connect(uri, **WS_CONNECT_OPTIONS) as websocket:
+                await websocket.send(subscribe_message(channel, symbol))
                 
-                print(f"Listening to {symbol} trades for {duration} seconds...")
-                start_time = time.time()
-                
-                while time.time() - start_time < duration:
-                    try:
-                        message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                        data = json.loads(message)
-                        
-                        if data.get('channel') == 'trades':
-                            print(f"Trade Executed - {data['symbol']}")
-                            print(f"  Price: {data['price']}")
-                            print(f"  Quantity: {data['quantity']}")
-                            print(f"  Side: {data['aggressor_side']}")
-                            print(f"  Time: {data['timestamp']}")
-                            print("-" * 40)
-                    except asyncio.TimeoutError:
-                        continue
+                # Single deadline for the whole session instead of polling per message
+                try:
+                    async with asyncio.timeout(duration):
+                        async for message in websocket:
+                            # bytes (binary frame) or str (text frame); both parse directly
+                            data = orjson.loads(message)
+                            
+                            frame_channel = data.get('channel')
+                            handler = FRAME_HANDLERS.get(frame_channel)
+                            if handler is not None:
+                                count = counts[frame_channel] = counts[frame_channel] + 1
+                                if DEMO_VERBOSE and count % LISTENER_REPORT_EVERY == 0:
+                                    handler(data, count)
+                except TimeoutError:
+                    pass
                         
         except Exception as e:
             print(f"WebSocket error: {e}")
+        
+        return counts[channel]
 
-async def demo_basic_functionality():
+async def demo_basic_functionality(demo: MatchingEngineDemo):
     """Demonstrate basic matching engine functionality"""
     print("=== Basic Functionality Demo ===")
     
-    async with MatchingEngineDemo() as demo:
-        symbol = "BTC-USDT"
-        
-        # 1. Check initial state
-        print("1. Checking initial order book...")
-        order_book = await demo.get_order_book(symbol)
-        print(f"Initial bids: {len(order_book.get('bids', []))}")
-        print(f"Initial asks: {len(order_book.get('asks', []))}")
-        
-        # 2. Submit buy limit orders
-        print("\n2. Submitting buy limit orders...")
-        buy_orders = []
-        for i in range(3):
-            price = Decimal('50000') - Decimal(str(i * 100))
-            order_data = {
-                'symbol': symbol,
-                'side': 'buy',
-                'order_type': 'limit',
-                'quantity': '1.0',
-                'price': str(price)
-            }
-            result = await demo.submit_order(order_data)
-            buy_orders.append(result['order_id'])
-            print(f"  Buy order at ${price}: {result['status']}")
-        
-        # 3. Submit sell limit orders
-        print("\n3. Submitting sell limit orders...")
-        sell_orders = []
-        for i in range(3):
-            price = Decimal('50200') + Decimal(str(i * 100))
-            order_data = {
-                'symbol': symbol,
-                'side': 'sell',
-                'order_type': 'limit',
-                'quantity': '1.0',
-                'price': str(price)
-            }
-            result = await demo.submit_order(order_data)
-            sell_orders.append(result['order_id'])
-            print(f"  Sell order at ${price}: {result['status']}")
-        
-        # 4. Check BBO
-        print("\n4. Checking Best Bid Offer...")
-        bbo = await demo.get_bbo(symbol)
-        print(f"  Best Bid: ${bbo.get('best_bid', 'N/A')}")
-        print(f"  Best Ask: ${bbo.get('best_ask', 'N/A')}")
-        print(f"  Spread: ${bbo.get('spread', 'N/A')}")
-        
-        # 5. Execute market order to create trade
-        print("\n5. Executing market buy to create trade...")
-        market_order = {
+    symbol = "BTC-USDT"
+    
+    # 1. Check initial state
+    print("1. Checking initial order book...")
+    order_book = await demo.get_order_book(symbol)
+    print(f"Initial bids: {len(order_book.get('bids', []))}")
+    print(f"Initial asks: {len(order_book.get('asks', []))}")
+    
+    # 2/3. Submit the buy and sell limit orders concurrently
+    buy_prices = [format_cents(5_000_000 - i * 10_000) for i in range(3)]
+    sell_prices = [format_cents(5_020_000 + i * 10_000) for i in range(3)]
+    
+    def limit_order(side, price):
+        return {
             'symbol': symbol,
-            'side': 'buy',
-            'order_type': 'market',
-            'quantity': '0.5'
+            'side': side,
+            'order_type': 'limit',
+            'quantity': '1.0',
+            'price': price
         }
-        result = await demo.submit_order(market_order)
-        print(f"  Market order result: {result['status']}")
-        
-        # 6. Check recent trades
-        print("\n6. Checking recent trades...")
-        trades = await demo.get_trades(symbol, 5)
-        for trade in trades:
-            print(f"  Trade: {trade['quantity']} @ ${trade['price']} - {trade['aggressor_side']}")
+    
+    buy_results, sell_results = await asyncio.gather(
+        asyncio.gather(*(demo.submit_order(limit_order('buy', price)) for price in buy_prices)),
+        asyncio.gather(*(demo.submit_order(limit_order('sell', price)) for price in sell_prices))
+    )
+    
+    print("\n2. Submitted buy limit orders...")
+    buy_orders = []
+    for price, result in zip(buy_prices, buy_results):
+        buy_orders.append(result['order_id'])
+        print(f"  Buy order at ${price}: {result['status']}")
+    
+    print("\n3. Submitted sell limit orders...")
+    sell_orders = []
+    for price, result in zip(sell_prices, sell_results):
+        sell_orders.append(result['order_id'])
+        print(f"  Sell order at ${price}: {result['status']}")
+    
+    # 4. Check BBO
+    print("\n4. Checking Best Bid Offer...")
+    bbo = await demo.get_bbo(symbol)
+    print(f"  Best Bid: ${bbo.get('best_bid', 'N/A')}")
+    print(f"  Best Ask: ${bbo.get('best_ask', 'N/A')}")
+    print(f"  Spread: ${bbo.get('spread', 'N/A')}")
+    
+    # 5. Execute market order to create trade
+    print("\n5. Executing market buy to create trade...")
+    market_order = {
+        'symbol': symbol,
+        'side': 'buy',
+        'order_type': 'market',
+        'quantity': '0.5'
+    }
+    result = await demo.submit_order(market_order)
+    print(f"  Market order result: {result['status']}")
+    
+    # 6. Check recent trades
+    print("\n6. Checking recent trades...")
+    trades = await demo.get_trades(symbol, 5)
+    for trade in trades:
+        print(f"  Trade: {trade['quantity']} @ ${trade['price']} - {trade['aggressor_side']}")
 
-async def demo_order_types():
+async def demo_order_types(demo: MatchingEngineDemo):
     """Demonstrate different order types"""
     print("\n=== Order Types Demo ===")
     
-    async with MatchingEngineDemo() as demo:
-        symbol = "ETH-USDT"
-        
-        # Set up initial liquidity
-        print("Setting up initial liquidity...")
-        await demo.submit_order({
-            'symbol': symbol,
-            'side': 'sell',
-            'order_type': 'limit',
-            'quantity': '2.0',
-            'price': '3000.00'
-        })
-        
-        # Test IOC order
-        print("\n1. Testing IOC (Immediate or Cancel) order...")
-        ioc_order = {
-            'symbol': symbol,
-            'side': 'buy',
-            'order_type': 'ioc',
-            'quantity': '1.0',
-            'price': '2950.00'  # Below market, should cancel
-        }
-        result = await demo.submit_order(ioc_order)
-        print(f"  IOC result: {result['status']}")
-        
-        # Test FOK order
-        print("\n2. Testing FOK (Fill or Kill) order...")
-        fok_order = {
-            'symbol': symbol,
-            'side': 'buy',
-            'order_type': 'fok',
-            'quantity': '5.0',  # More than available
-            'price': '3100.00'
-        }
-        result = await demo.submit_order(fok_order)
-        print(f"  FOK result: {result['status']}")
-        
-        # Test successful market order
-        print("\n3. Testing market order...")
-        market_order = {
-            'symbol': symbol,
-            'side': 'buy',
-            'order_type': 'market',
-            'quantity': '1.0'
-        }
-        result = await demo.submit_order(market_order)
-        print(f"  Market order result: {result['status']}")
+    symbol = "ETH-USDT"
+    
+    # Set up initial liquidity
+    print("Setting up initial liquidity...")
+    await demo.submit_order({
+        'symbol': symbol,
+        'side': 'sell',
+        'order_type': 'limit',
+        'quantity': '2.0',
+        'price': '3000.00'
+    })
+    
+    # Test IOC order
+    print("\n1. Testing IOC (Immediate or Cancel) order...")
+    ioc_order = {
+        'symbol': symbol,
+        'side': 'buy',
+        'order_type': 'ioc',
+        'quantity': '1.0',
+        'price': '2950.00'  # Below market, should cancel
+    }
+    result = await demo.submit_order(ioc_order)
+    print(f"  IOC result: {result['status']}")
+    
+    # Test FOK order
+    print("\n2. Testing FOK (Fill or Kill) order...")
+    fok_order = {
+        'symbol': symbol,
+        'side': 'buy',
+        'order_type': 'fok',
+        'quantity': '5.0',  # More than available
+        'price': '3100.00'
+    }
+    result = await demo.submit_order(fok_order)
+    print(f"  FOK result: {result['status']}")
+    
+    # Test successful market order
+    print("\n3. Testing market order...")
+    market_order = {
+        'symbol': symbol,
+        'side': 'buy',
+        'order_type': 'market',
+        'quantity': '1.0'
+    }
+    result = await demo.submit_order(market_order)
+    print(f"  Market order result: {result['status']}")
 
-async def demo_websocket_feeds():
+async def demo_websocket_feeds(demo: MatchingEngineDemo):
     """Demonstrate WebSocket market data and trade feeds"""
     print("\n=== WebSocket Feeds Demo ===")
     
@@ -241,88 +317,80 @@ async def demo_websocket_feeds():
         """Generate random orders to create market activity"""
         await asyncio.sleep(5)  # Wait for listeners to connect
         
-        async with MatchingEngineDemo() as demo:
-            for i in range(10):
-                # Random buy order
-                buy_price = random.uniform(49500, 49800)
-                buy_order = {
-                    'symbol': symbol,
-                    'side': 'buy',
-                    'order_type': 'limit',
-                    'quantity': str(round(random.uniform(0.1, 1.0), 2)),
-                    'price': str(round(buy_price, 2))
-                }
-                await demo.submit_order(buy_order)
-                
-                # Random sell order
-                sell_price = random.uniform(50200, 50500)
-                sell_order = {
+        # Draw all random order fields up front from one seeded generator as
+        # integer cents/hundredths and format them once, so the loop only indexes
+        num_rounds = 10
+        rng = np.random.default_rng(DEMO_SEED)
+        buy_prices = [format_cents(c) for c in rng.integers(4_950_000, 4_980_001, num_rounds).tolist()]
+        buy_quantities = [format_cents(q) for q in rng.integers(10, 101, num_rounds).tolist()]
+        sell_prices = [format_cents(c) for c in rng.integers(5_020_000, 5_050_001, num_rounds).tolist()]
+        sell_quantities = [format_cents(q) for q in rng.integers(10, 101, num_rounds).tolist()]
+        market_sides = rng.choice(['buy', 'sell'], num_rounds).tolist()
+        market_quantities = [format_cents(q) for q in rng.integers(10, 51, num_rounds).tolist()]
+        
+        for i in range(num_rounds):
+            # Random buy order
+            await demo.submit_order_body(
+                limit_order_body('buy', buy_quantities[i], buy_prices[i])
+            )
+            
+            # Random sell order
+            await demo.submit_order_body(
+                limit_order_body('sell', sell_quantities[i], sell_prices[i])
+            )
+            
+            # Occasionally create trades with market orders
+            if i % 3 == 0:
+                market_order = {
                     'symbol': symbol,
-                    'side': 'sell',
-                    'order_type': 'limit',
-                    'quantity': str(round(random.uniform(0.1, 1.0), 2)),
-                    'price': str(round(sell_price, 2))
+                    'side': market_sides[i],
+                    'order_type': 'market',
+                    'quantity': market_quantities[i]
                 }
-                await demo.submit_order(sell_order)
-                
-                # Occasionally create trades with market orders
-                if i % 3 == 0:
-                    market_order = {
-                        'symbol': symbol,
-                        'side': random.choice(['buy', 'sell']),
-                        'order_type': 'market',
-                        'quantity': str(round(random.uniform(0.1, 0.5), 2))
-                    }
-                    await demo.submit_order(market_order)
-                
-                await asyncio.sleep(2)
-    
+                await demo.submit_order(market_order)
+            
+            await asyncio.sleep(2)
+
     # Run WebSocket listeners and order generator concurrently
-    async with MatchingEngineDemo() as demo:
-        await asyncio.gather(
-            demo.listen_to_market_data(symbol, 30),
-            demo.listen_to_trades(symbol, 30),
-            generate_orders()
-        )
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(demo.listen_to_market_data(symbol, 30))
+        tg.create_task(demo.listen_to_trades(symbol, 30))
+        tg.create_task(generate_orders())
 
-async def performance_test():
+async def performance_test(demo: MatchingEngineDemo):
     """Simple performance test"""
     print("\n=== Performance Test ===")
     
-    async with MatchingEngineDemo() as demo:
-        symbol = "BTC-USDT"
-        num_orders = 100
-        
-        print(f"Submitting {num_orders} orders...")
-        start_time = time.time()
-        
-        tasks = []
-        for i in range(num_orders):
-            side = 'buy' if i % 2 == 0 else 'sell'
-            base_price = 50000 if side == 'buy' else 50100
-            price = base_price + random.randint(-50, 50)
-            
-            order_data = {
-                'symbol': symbol,
-                'side': side,
-                'order_type': 'limit',
-                'quantity': str(round(random.uniform(0.1, 1.0), 2)),
-                'price': str(price)
-            }
-            task = demo.submit_order(order_data)
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks)
-        end_time = time.time()
-        
-        successful_orders = sum(1 for r in results if r.get('status') == 'success')
-        duration = end_time - start_time
-        
-        print(f"Results:")
-        print(f"  Total orders: {num_orders}")
-        print(f"  Successful: {successful_orders}")
-        print(f"  Duration: {duration:.2f} seconds")
-        print(f"  Orders per second: {successful_orders / duration:.2f}")
+    num_orders = 100
+    
+    # Draw every order's random fields in one vectorised pass
+    rng = np.random.default_rng()
+    is_sell = np.arange(num_orders) % 2
+    sides = np.where(is_sell, 'sell', 'buy').tolist()
+    prices = (50000 + is_sell * 100 + rng.integers(-50, 51, num_orders)).tolist()
+    quantities = np.round(rng.uniform(0.1, 1.0, num_orders), 2).tolist()
+    
+    print(f"Submitting {num_orders} orders...")
+    start_time = time.time()
+    
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(demo.submit_order_body(
+                limit_order_body(sides[i], str(quantities[i]), str(prices[i]))
+            ))
+            for i in range(num_orders)
+        ]
+    results = [task.result() for task in tasks]
+    end_time = time.time()
+    
+    successful_orders = sum(1 for r in results if r.get('status') == 'success')
+    duration = end_time - start_time
+    
+    print(f"Results:")
+    print(f"  Total orders: {num_orders}")
+    print(f"  Successful: {successful_orders}")
+    print(f"  Duration: {duration:.2f} seconds")
+    print(f"  Orders per second: {successful_orders / duration:.2f}")
 
 async def main():
     """Main demo function"""
@@ -330,17 +398,19 @@ async def main():
     print("=" * 50)
     
     try:
-        await demo_basic_functionality()
-        await asyncio.sleep(2)
-        
-        await demo_order_types()
-        await asyncio.sleep(2)
-        
-        await performance_test()
-        await asyncio.sleep(2)
-        
-        print("\nStarting WebSocket demo (will run for 30 seconds)...")
-        await demo_websocket_feeds()
+        # One client session is shared by every demo phase
+        async with MatchingEngineDemo() as demo:
+            await demo_basic_functionality(demo)
+            await asyncio.sleep(2)
+            
+            await demo_order_types(demo)
+            await asyncio.sleep(2)
+            
+            await performance_test(demo)
+            await asyncio.sleep(2)
+            
+            print("\nStarting WebSocket demo (will run for 30 seconds)...")
+            await demo_websocket_feeds(demo)
         
     except Exception as e:
         print(f"Demo error: {e}")
@@ -353,6 +423,14 @@ if __name__ == "__main__":
     print("  WebSocket: ws://localhost:8001")
     print("\nPress Ctrl+C to stop the demo\n")
     
+    # uvloop ships with uvicorn[standard]; fall back to the default loop where it
+    # is unavailable (e.g. Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
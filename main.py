@@ -125,11 +125,13 @@ import asyncio
 import logging
 from fastapi import FastAPI, WebSocket, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from src.api.rest_api import create_rest_api
-from src.api.websocket_api import websocket_market_data_endpoint, websocket_trade_feed_endpoint
+from src.api.websocket_api import connection_manager, websocket_market_data_endpoint, websocket_trade_feed_endpoint
 from src.core.matching_engine import matching_engine
+from config import CONFIG
 
 logging.basicConfig(
     level=logging.INFO,
@@ -146,6 +148,13 @@ async def lifespan(app: FastAPI):
     """Application lifespan management"""
     logger.info("Starting Cryptocurrency Matching Engine...")
     
+    # Refuse to start on bad settings, with the reason in the log
+    try:
+        CONFIG.validate()
+    except ValueError as e:
+        logger.critical("Invalid configuration: %s", e)
+        raise
+    
     # Initialize matching engine
     await matching_engine.start()
     logger.info("Matching engine started successfully")
@@ -155,13 +164,15 @@ async def lifespan(app: FastAPI):
     # Cleanup
     logger.info("Shutting down matching engine...")
     await matching_engine.stop()
+    await connection_manager.close()
     logger.info("Matching engine stopped")
 
 app = FastAPI(
     title="Cryptocurrency Matching Engine",
     description="High-performance matching engine with REG NMS-inspired principles",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson's C encoder for every JSON route
 )
 
 app.add_middleware(
@@ -208,5 +219,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
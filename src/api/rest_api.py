@@ -1,40 +1,43 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from fastapi import APIRouter, FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, model_validator
+from typing import Annotated, Literal, Optional, List
 from decimal import Decimal
 import logging
-# from ..core.matching_engine import matching_engine
+import time
+from ..core.matching_engine import matching_engine
 
 # configure logging
 logger = logging.getLogger(__name__)
 
+def _lower(v):
+    return v.lower() if isinstance(v, str) else v
+
+# Case-insensitive enums checked by pydantic-core's Literal validator rather than
+# Python-level @validator methods
+OrderTypeField = Annotated[Literal['market', 'limit', 'ioc', 'fok'], BeforeValidator(_lower)]
+SideField = Annotated[Literal['buy', 'sell'], BeforeValidator(_lower)]
+
+PRICED_ORDER_TYPES = frozenset(('limit', 'ioc', 'fok'))
+
 # pydantic models for request and response validation
 class OrderRequest(BaseModel):
+    # Requests are read-only once parsed; no assignment validation is ever needed
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
+
     symbol : str = Field(..., description = "Trading symbol, e.g., 'BTC-USDT'")
-    order_type : str = Field(..., description= "Order type: market, limit, ioc, fok")
-    side : str = Field(..., description= "Order side: buy or sell")
+    order_type : OrderTypeField = Field(..., description= "Order type: market, limit, ioc, fok")
+    side : SideField = Field(..., description= "Order side: buy or sell")
     quantity : float = Field(..., gt = 0, description= "Order quantity, must be positive.")
     price : Optional[float] = Field(None, gt = 0, description= "Order price(required for limit orders)")
     order_id : Optional[str] = Field(None, description = "Optional custom order ID")
 
-    @validator('order_type')
-    def validate_order_type(cls, v):
-        if v.lower() not in ['market', 'limit', 'ioc', 'fok']:
-            raise ValueError("Invalid order type. Must be one of: market, limit, ioc, fok.")
-        return v.lower()
-
-    @validator('side')
-    def validate_side(cls, v):
-        if v.lower() not in ['buy', 'sell']:
-            raise ValueError("Invalid order side. Must be 'buy' or 'sell'.")
-        return v.lower()
-    
-    @validator('price')
-    def validate_price_for_limit_orders(cls, v, values):
-        order_type = values.get('order_type', '').lower()
-        if order_type in ['limit', 'ioc', 'fok'] and v is None:
-            raise ValueError(f'price is required for {order_type} orders')
-        return v
+    @model_validator(mode='after')
+    def validate_price_for_limit_orders(self):
+        # Runs once after the per-field checks, so order_type is already normalized
+        if self.price is None and self.order_type in PRICED_ORDER_TYPES:
+            raise ValueError(f'price is required for {self.order_type} orders')
+        return self
     
 class OrderResponse(BaseModel):
     status : str
@@ -43,6 +46,8 @@ class OrderResponse(BaseModel):
     message : Optional[str] = None
 
 class CancelOrderRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
+
     order_id : str = Field(..., description = "ID of the order to cancel")
 
 class MarketDataResponse(BaseModel):
@@ -59,177 +64,201 @@ class BBOResponse(BaseModel):
     spread: Optional[str]
     timestamp: str
 
-def create_rest_api(app, matching_engine):
+# Endpoints are defined once at import; each handler reads the engine that
+# create_rest_api stored on its own app, so separate apps never share one. The
+# engine is read from request.app.state directly rather than through Depends(),
+# which would add a dependency resolution to every request.
+router = APIRouter()
+
+# Statistics are recomputed at most once per TTL and shared by /health,
+# /statistics and /symbols, so frequent health polling stays cheap. The cache
+# lives on app.state next to the engine it caches.
+STATS_CACHE_TTL = 0.25
+
+async def _cached_statistics(request: Request) -> dict:
+    state = request.app.state
+    cache = state.stats_cache
+    now = time.monotonic()
+    if cache['val'] is None or now - cache['ts'] > STATS_CACHE_TTL:
+        cache['val'] = await state.matching_engine.get_statistics()
+        cache['ts'] = now
+    return cache['val']
+
+@router.get("/")
+async def root():
+    return {
+        "message": "CryptoCurrency Matching Engine API",
+        "status": "running",
+        "version": "1.0.0"
+    }
+
+@router.get("/health")
+async def health_check(request: Request):
+    # health check with engine statistics
+    stats = await _cached_statistics(request)
+    return{
+        "status" : "healthy",
+        "engine_stats": stats
+    }
+
+@router.post("/orders", response_model=OrderResponse)
+async def submit_order(order_request: OrderRequest, request: Request):
     """
-    Create the FastAPI application with all endpoints.
-    
-    :param matching_engine: Instance of the MatchingEngine class
-    :return: FastAPI app instance
+    Submit a new order to the matching engine.
+
+    - **symbol**: Trading pair (e.g., "BTC-USDT")
+    - **order_type**: Type of order (market, limit, ioc, fok)
+    - **side**: buy or sell
+    - **quantity**: Amount to trade (must be positive)
+    - **price**: Price level (required for limit orders)
+    """
+    try:
+        # Convert to dict for matching engine
+        order_dict = order_request.model_dump()
+
+        # Submit to matching engine
+        result = await request.app.state.matching_engine.submit_order(order_dict)
+
+        if result['status'] == 'success':
+            return ORJSONResponse(content=result)
+        else:
+            raise HTTPException(status_code=400, detail=result.get('message', 'Order submission failed'))
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error submitting order: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/orders/{order_id}")
+async def cancel_order(order_id: str, request: Request):
+    """Cancel an existing order by order ID."""
+    try:
+        result = await request.app.state.matching_engine.cancel_order(order_id)
+
+        if result['status'] == 'success':
+            return ORJSONResponse(content=result)
+        else:
+            raise HTTPException(status_code=404, detail=result.get('message', 'Order not found'))
+
+    except Exception as e:
+        logger.error(f"Error cancelling order {order_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/orders/{order_id}")
+async def get_order_status(order_id: str, request: Request):
+    """Get the status of a specific order."""
+    try:
+        result = request.app.state.matching_engine.get_order_status(order_id)
+
+        if result['status'] == 'success':
+            return result
+        else:
+            raise HTTPException(status_code=404, detail=result.get('message', 'Order not found'))
+
+    except Exception as e:
+        logger.error(f"Error getting order status {order_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/market-data/{symbol}/depth", response_model=MarketDataResponse)
+async def get_order_book_depth(request: Request, symbol: str, levels: int = 10):
     """
-    # app = FastAPI(
-    #     title = "CryptoCurrency Matching Engine API",
-    #     description= "High-performance cryptocurrency matching engine with REG NMS-inspired principles",
-    #     version= "1.0.0"
-    # )
-
-    @app.get("/")
-    async def root():
+    Get order book depth for a trading pair.
+
+    - **symbol**: Trading pair symbol
+    - **levels**: Number of price levels to return (default: 10)
+    """
+    try:
+        if levels <= 0 or levels > 100:
+            raise HTTPException(status_code=400, detail="levels must be between 1 and 100")
+
+        depth = request.app.state.matching_engine.get_order_book_depth(symbol, levels)
+        return ORJSONResponse(content=depth)
+
+    except Exception as e:
+        logger.error(f"Error getting order book depth for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/market-data/{symbol}/bbo", response_model=BBOResponse)
+async def get_best_bid_offer(symbol: str, request: Request):
+    """
+    Get Best Bid and Offer (BBO) for a trading pair.
+
+    - **symbol**: Trading pair symbol
+    """
+    try:
+        bbo = request.app.state.matching_engine.get_bbo(symbol)
+        return ORJSONResponse(content=bbo)
+
+    except Exception as e:
+        logger.error(f"Error getting BBO for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/trades/{symbol}")
+async def get_recent_trades(request: Request, symbol: str, limit: int = 100):
+    """
+    Get recent trades for a trading pair.
+
+    - **symbol**: Trading pair symbol  
+    - **limit**: Maximum number of trades to return (default: 100)
+    """
+    try:
+        if limit <= 0 or limit > 1000:
+            raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+
+        trades = request.app.state.matching_engine.get_recent_trades(symbol, limit)
+        return ORJSONResponse(content={
+            "symbol": symbol,
+            "trades": trades,
+            "count": len(trades)
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting recent trades for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/statistics")
+async def get_engine_statistics(request: Request):
+    """Get matching engine statistics and performance metrics."""
+    try:
+        stats = await _cached_statistics(request)
+        return stats
+
+    except Exception as e:
+        logger.error(f"Error getting statistics: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/symbols")
+async def get_active_symbols(request: Request):
+    """Get list of active trading symbols."""
+    try:
+        stats = await _cached_statistics(request)
         return {
-            "message": "CryptoCurrency Matching Engine API",
-            "status": "running",
-            "version": "1.0.0"
+            "symbols": stats.get('active_symbols', []),
+            "count": stats.get('total_symbols', 0)
         }
 
-    @app.get("/health")
-    async def health_check():
-        # health check with engine statistics
-        stats = matching_engine.get_statistics()
-        return{
-            "status" : "healthy",
-            "engine_stats": stats
-        }
+    except Exception as e:
+        logger.error(f"Error getting active symbols: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
-    @app.post("/orders", response_model=OrderResponse)
-    async def submit_order(order_request: OrderRequest):
-        """
-        Submit a new order to the matching engine.
-        
-        - **symbol**: Trading pair (e.g., "BTC-USDT")
-        - **order_type**: Type of order (market, limit, ioc, fok)
-        - **side**: buy or sell
-        - **quantity**: Amount to trade (must be positive)
-        - **price**: Price level (required for limit orders)
-        """
-        try:
-            # Convert to dict for matching engine
-            order_dict = order_request.dict()
-            
-            # Submit to matching engine
-            result = await matching_engine.submit_order(order_dict)
-            
-            if result['status'] == 'success':
-                return OrderResponse(**result)
-            else:
-                raise HTTPException(status_code=400, detail=result.get('message', 'Order submission failed'))
-                
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            logger.error(f"Error submitting order: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-        
-    @app.delete("/orders/{order_id}")
-    async def cancel_order(order_id: str):
-        """Cancel an existing order by order ID."""
-        try:
-            result = await matching_engine.cancel_order(order_id)
-            
-            if result['status'] == 'success':
-                return result
-            else:
-                raise HTTPException(status_code=404, detail=result.get('message', 'Order not found'))
-                
-        except Exception as e:
-            logger.error(f"Error cancelling order {order_id}: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-        
-    @app.get("/orders/{order_id}")
-    async def get_order_status(order_id: str):
-        """Get the status of a specific order."""
-        try:
-            result = matching_engine.get_order_status(order_id)
-            
-            if result['status'] == 'success':
-                return result
-            else:
-                raise HTTPException(status_code=404, detail=result.get('message', 'Order not found'))
-                
-        except Exception as e:
-            logger.error(f"Error getting order status {order_id}: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-
-    @app.get("/market-data/{symbol}/depth", response_model=MarketDataResponse)
-    async def get_order_book_depth(symbol: str, levels: int = 10):
-        """
-        Get order book depth for a trading pair.
-        
-        - **symbol**: Trading pair symbol
-        - **levels**: Number of price levels to return (default: 10)
-        """
-        try:
-            if levels <= 0 or levels > 100:
-                raise HTTPException(status_code=400, detail="levels must be between 1 and 100")
-            
-            depth = matching_engine.get_order_book_depth(symbol, levels)
-            return MarketDataResponse(**depth)
-            
-        except Exception as e:
-            logger.error(f"Error getting order book depth for {symbol}: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-        
-    @app.get("/market-data/{symbol}/bbo", response_model=BBOResponse)
-    async def get_best_bid_offer(symbol: str):
-        """
-        Get Best Bid and Offer (BBO) for a trading pair.
-        
-        - **symbol**: Trading pair symbol
-        """
-        try:
-            bbo = matching_engine.get_bbo(symbol)
-            return BBOResponse(**bbo)
-            
-        except Exception as e:
-            logger.error(f"Error getting BBO for {symbol}: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-        
-    @app.get("/trades/{symbol}")
-    async def get_recent_trades(symbol: str, limit: int = 100):
-        """
-        Get recent trades for a trading pair.
-        
-        - **symbol**: Trading pair symbol  
-        - **limit**: Maximum number of trades to return (default: 100)
-        """
-        try:
-            if limit <= 0 or limit > 1000:
-                raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
-            
-            trades = matching_engine.get_recent_trades(symbol, limit)
-            return {
-                "symbol": symbol,
-                "trades": trades,
-                "count": len(trades)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting recent trades for {symbol}: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-
-    @app.get("/statistics")
-    async def get_engine_statistics():
-        """Get matching engine statistics and performance metrics."""
-        try:
-            stats = matching_engine.get_statistics()
-            return stats
-            
-        except Exception as e:
-            logger.error(f"Error getting statistics: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
-        
-    @app.get("/symbols")
-    async def get_active_symbols():
-        """Get list of active trading symbols."""
-        try:
-            stats = matching_engine.get_statistics()
-            return {
-                "symbols": stats.get('active_symbols', []),
-                "count": stats.get('total_symbols', 0)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting active symbols: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
+def create_rest_api(app, engine=None):
+    """
+    Create the FastAPI application with all endpoints.
+
+    Engine results are already JSON-ready dicts of strings, so handlers return
+    them as ORJSONResponse directly; response_model is kept for the OpenAPI
+    schema only and the trusted output is not validated a second time.
     
+    :param engine: MatchingEngine to serve; defaults to the global instance
+    :return: FastAPI app instance
+    """
+    # Per-app engine and statistics cache, read by the handlers and _cached_statistics
+    app.state.matching_engine = engine if engine is not None else matching_engine
+    app.state.stats_cache = {'ts': 0.0, 'val': None}
+
+    app.include_router(router)
+
     # Error handlers
     @app.exception_handler(ValueError)
     async def value_error_handler(request, exc):
@@ -245,6 +274,13 @@ def create_rest_api(app, matching_engine):
 
 if __name__ == "__main__":
     import uvicorn
-    from ..core.matching_engine import matching_engine
-    app = create_rest_api(matching_engine)
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    app = create_rest_api(FastAPI(default_response_class=ORJSONResponse))
+    # One worker: the engine keeps its order books in this process's memory
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
+    )
@@ -1,146 +1,316 @@
-from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List, Set
+from fastapi import WebSocket
+from typing import Dict, List, Optional, Tuple
 import asyncio
-import json
 import logging
+from itertools import islice
+import orjson
+import time
 from datetime import datetime, timezone
+from weakref import WeakKeyDictionary, WeakSet
 from ..core.matching_engine import matching_engine
+from ..core.order import PRICE_SCALE
 
 logger = logging.getLogger(__name__)
 
+# A subscriber that cannot take a broadcast within this many seconds is dropped,
+# so one stuck socket cannot hold up the feed
+BROADCAST_SEND_TIMEOUT = 0.1
+
+# Price levels per side in order book snapshots sent to market-data subscribers
+SNAPSHOT_DEPTH_LEVELS = 10
+
+# Order book changes are coalesced and broadcast at most once per symbol per tick
+ORDER_BOOK_TICK_SECONDS = 0.01
+
+def _encode(data: dict) -> bytes:
+    """
+    Serialize a feed message with orjson; Decimal and other unknown types fall back
+    to str(). Messages go out as binary frames holding this UTF-8 JSON as-is.
+    """
+    return orjson.dumps(data, default=str)
+
+# Broadcast timestamps are formatted at most once per millisecond and reused
+# within it
+_TIMESTAMP_GRANULARITY_NS = 1_000_000
+_last_ts_ns = 0
+_last_ts_str = ''
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp for feed messages, cached at millisecond granularity"""
+    global _last_ts_ns, _last_ts_str
+    now_ns = time.time_ns()
+    if now_ns - _last_ts_ns >= _TIMESTAMP_GRANULARITY_NS:
+        _last_ts_str = datetime.fromtimestamp(now_ns / 1e9, timezone.utc).isoformat()
+        _last_ts_ns = now_ns
+    return _last_ts_str
+
+class SymbolFanout:
+    """
+    Subscriber state for one symbol. Each shard owns its subscriber tuples and its
+    order book coalescing, so traffic on one symbol never touches another's state.
+    Subscriber tuples are replaced, never mutated, on connect/disconnect; a fanout
+    already in flight keeps the tuple it started with.
+    """
+    __slots__ = ('market_data', 'trades', 'dirty_book', 'dirty_event', 'coalesce_task')
+
+    def __init__(self):
+        self.market_data : Tuple[WebSocket, ...] = ()
+        self.trades : Tuple[WebSocket, ...] = ()
+
+        # Latest changed order book, drained by this symbol's coalescing task
+        self.dirty_book = None
+        self.dirty_event = asyncio.Event()
+        self.coalesce_task : Optional[asyncio.Task] = None
+
 class ConnectionManager:
     def __init__(self):
-        self.market_data_connections : Dict[str, Set[WebSocket]] = {}
-        self.trade_feed_connections : Dict[str, Set[WebSocket]] = {}
-        self.all_connections : Set[WebSocket] = set()
+        self.fanouts : Dict[str, SymbolFanout] = {}
+        # Weak references: a socket that dies without a clean disconnect is not
+        # kept alive by this registry
+        self.all_connections : WeakSet[WebSocket] = WeakSet()
+        # Symbol each socket subscribed to, so disconnect goes straight to its shard
+        self._socket_symbols : WeakKeyDictionary = WeakKeyDictionary()
+
+    def _fanout(self, symbol: str) -> SymbolFanout:
+        fanout = self.fanouts.get(symbol)
+        if fanout is None:
+            fanout = self.fanouts[symbol] = SymbolFanout()
+        return fanout
 
     async def connect_market_data(self, websocket: WebSocket, symbol: str):
         await websocket.accept()
-        if symbol not in self.market_data_connections:
-            self.market_data_connections[symbol] = set()
-        self.market_data_connections[symbol].add(websocket)
+        # No await between the read and the write of the tuple, so this cannot
+        # interleave with another coroutine's update and needs no lock
+        fanout = self._fanout(symbol)
+        if websocket not in fanout.market_data:
+            fanout.market_data += (websocket,)
+        self._socket_symbols[websocket] = symbol
         self.all_connections.add(websocket)
         logger.info(f"Client connected to market data for {symbol}")
 
     async def connect_trade_feed(self, websocket: WebSocket, symbol: str):
         await websocket.accept()
-        if symbol not in self.trade_feed_connections:
-            self.trade_feed_connections[symbol] = set()
-        self.trade_feed_connections[symbol].add(websocket)
+        fanout = self._fanout(symbol)
+        if websocket not in fanout.trades:
+            fanout.trades += (websocket,)
+        self._socket_symbols[websocket] = symbol
         self.all_connections.add(websocket)
         logger.info(f"Client connected to trade feed for {symbol}")
 
     def disconnect(self, websocket: WebSocket):
         self.all_connections.discard(websocket)
-        # Remove from market data connections
-        for symbol_connections in self.market_data_connections.values():
-            symbol_connections.discard(websocket)
-        # Remove from trade feed connections
-        for symbol_connections in self.trade_feed_connections.values():
-            symbol_connections.discard(websocket)
+        fanout = self.fanouts.get(self._socket_symbols.pop(websocket, None))
+        if fanout is not None:
+            if websocket in fanout.market_data:
+                fanout.market_data = tuple(ws for ws in fanout.market_data if ws is not websocket)
+            if websocket in fanout.trades:
+                fanout.trades = tuple(ws for ws in fanout.trades if ws is not websocket)
         logger.info("Client disconnected")
 
     async def broadcast_market_data(self, symbol: str, data: dict):
-        if symbol in self.market_data_connections:
-            disconnected = set()
-            for websocket in self.market_data_connections[symbol]:
-                try:
-                    await websocket.send_text(json.dumps(data, default=str))
-                except Exception as e:
-                    logger.error(f"Error sending market data: {e}")
-                    disconnected.add(websocket)
-            
-            # Clean up disconnected websockets
-            for ws in disconnected:
-                self.disconnect(ws)
+        fanout = self.fanouts.get(symbol)
+        if fanout is not None:
+            await self._broadcast(fanout.market_data, data, "market data")
 
     async def broadcast_trade_execution(self, symbol: str, trade_data: dict):
-        if symbol in self.trade_feed_connections:
-            disconnected = set()
-            for websocket in self.trade_feed_connections[symbol]:
-                try:
-                    await websocket.send_text(json.dumps(trade_data, default=str))
-                except Exception as e:
-                    logger.error(f"Error sending trade data: {e}")
-                    disconnected.add(websocket)
-            
-            # Clean up disconnected websockets
-            for ws in disconnected:
+        fanout = self.fanouts.get(symbol)
+        if fanout is not None:
+            await self._broadcast(fanout.trades, trade_data, "trade data")
+
+    def mark_order_book_dirty(self, symbol: str, order_book):
+        """
+        Record that a symbol's book changed. Repeated changes within a tick
+        collapse into one snapshot broadcast of the latest state.
+        """
+        fanout = self._fanout(symbol)
+        if not fanout.market_data:
+            # Nobody to send to; a new subscriber gets its own snapshot on connect
+            return
+        fanout.dirty_book = order_book
+        fanout.dirty_event.set()
+        if fanout.coalesce_task is None or fanout.coalesce_task.done():
+            fanout.coalesce_task = asyncio.create_task(self._coalesce_order_book(symbol, fanout))
+
+    async def _coalesce_order_book(self, symbol: str, fanout: SymbolFanout):
+        # Runs while the symbol has market data subscribers; once the last one
+        # leaves, the next change ends the task and a later one restarts it
+        while True:
+            await fanout.dirty_event.wait()
+            fanout.dirty_event.clear()
+            order_book, fanout.dirty_book = fanout.dirty_book, None
+            if not fanout.market_data:
+                return
+
+            try:
+                await self._broadcast(fanout.market_data, _order_book_message(symbol, order_book), "market data")
+            except Exception as e:
+                logger.error(f"Error broadcasting order book for {symbol}: {e}")
+
+            await asyncio.sleep(ORDER_BOOK_TICK_SECONDS)
+
+    async def close(self):
+        """Stop every symbol's coalescing task; called on application shutdown"""
+        tasks = [fanout.coalesce_task for fanout in self.fanouts.values()
+                 if fanout.coalesce_task is not None and not fanout.coalesce_task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for fanout in self.fanouts.values():
+            fanout.coalesce_task = None
+
+    async def _broadcast(self, subscribers: Tuple[WebSocket, ...], data: dict, kind: str):
+        if not subscribers:
+            return
+
+        # Encode once per fanout; every subscriber receives the same payload
+        payload = _encode(data)
+        # Overlap the writes so a slow subscriber does not delay the others
+        results = await asyncio.gather(
+            *(asyncio.wait_for(websocket.send_bytes(payload), BROADCAST_SEND_TIMEOUT) for websocket in subscribers),
+            return_exceptions=True
+        )
+
+        # Drop failed or timed-out subscribers from the fanout first, then close
+        # them: the client learns it was cut off, its endpoint loop ends, and a
+        # write cancelled mid-frame does not leave the stream in use
+        failed = []
+        for ws, result in zip(subscribers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending {kind}: {result!r}")
                 self.disconnect(ws)
+                failed.append(ws)
+        if failed:
+            await asyncio.gather(*(_close_quietly(ws) for ws in failed))
+
+async def _close_quietly(websocket: WebSocket):
+    """Best-effort close of a subscriber that fell behind or failed"""
+    try:
+        await asyncio.wait_for(websocket.close(code=1011), BROADCAST_SEND_TIMEOUT)
+    except Exception:
+        pass
 
 # Global connection manager instance
 connection_manager = ConnectionManager()
 
+async def _wait_for_disconnect(websocket: WebSocket):
+    """
+    Keep the connection open until the client leaves. Inbound frames are drained
+    as raw ASGI messages without decoding their payload or raising per disconnect.
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
 # WebSocket endpoints
 async def websocket_market_data_endpoint(websocket: WebSocket, symbol: str):
     await connection_manager.connect_market_data(websocket, symbol)
     
-    # Send initial order book snapshot
+    # Send initial order book snapshot, bounded to the top levels so a deep book
+    # does not stall the event loop while a subscriber connects
     try:
-        order_book = matching_engine.get_order_book(symbol)
-        if order_book:
-            market_data = {
-                "type": "orderbook",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "symbol": symbol,
-                "bids": order_book.get_bids_snapshot(),
-                "asks": order_book.get_asks_snapshot()
-            }
-            await websocket.send_text(json.dumps(market_data, default=str))
+        order_book = matching_engine.order_books.get(symbol)
+        if order_book is not None:
+            await websocket.send_bytes(_encode(_order_book_message(symbol, order_book)))
     except Exception as e:
         logger.error(f"Error sending initial snapshot: {e}")
 
     try:
-        while True:
-            # Keep connection alive and handle any incoming messages
-            await websocket.receive_text()
-    except WebSocketDisconnect:
+        await _wait_for_disconnect(websocket)
+    finally:
         connection_manager.disconnect(websocket)
 
 async def websocket_trade_feed_endpoint(websocket: WebSocket, symbol: str):
     await connection_manager.connect_trade_feed(websocket, symbol)
     
     try:
-        while True:
-            # Keep connection alive and handle any incoming messages
-            await websocket.receive_text()
-    except WebSocketDisconnect:
+        await _wait_for_disconnect(websocket)
+    finally:
         connection_manager.disconnect(websocket)
 
 # Market data update functions (called by matching engine)
-async def broadcast_order_book_update(symbol: str, order_book):
-    """Called by matching engine when order book changes"""
-    market_data = {
+def _order_book_message(symbol: str, order_book) -> dict:
+    # Levels are [price_ticks, quantity_lots] integer pairs at price_scale, the
+    # same units as trade and BBO frames, read straight from the book's sorted
+    # price indexes without formatting
+    bid_levels = order_book.bid_levels
+    ask_levels = order_book.ask_levels
+    return {
         "type": "orderbook",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _utc_timestamp(),
         "symbol": symbol,
-        "bids": order_book.get_bids_snapshot(),
-        "asks": order_book.get_asks_snapshot()
+        "bids": [[price, bid_levels[price].total_quantity]
+                 for price in islice(reversed(order_book.bid_prices), SNAPSHOT_DEPTH_LEVELS)],
+        "asks": [[price, ask_levels[price].total_quantity]
+                 for price in islice(order_book.ask_prices, SNAPSHOT_DEPTH_LEVELS)],
+        "price_scale": PRICE_SCALE
     }
-    await connection_manager.broadcast_market_data(symbol, market_data)
 
-async def broadcast_trade_execution(symbol: str, trade):
-    """Called by matching engine when trade executes"""
-    trade_data = {
+async def broadcast_order_book_update(symbol: str, order_book):
+    """Called by matching engine when order book changes; sent on the next coalescing tick"""
+    connection_manager.mark_order_book_dirty(symbol, order_book)
+
+def _trade_message(symbol: str, trade) -> dict:
+    # Every value is a type orjson encodes natively in C (the aware datetime comes
+    # out in the same ISO-8601 form as isoformat()), so the default=str fallback
+    # is never entered for trades. Price and quantity go out as the trade's own
+    # integer ticks at price_scale; clients divide to recover the decimal value
+    return {
         "type": "trade",
-        "timestamp": trade.timestamp.isoformat(),
+        "timestamp": trade.timestamp,
         "symbol": symbol,
         "trade_id": trade.trade_id,
-        "price": str(trade.price),
-        "quantity": str(trade.quantity),
-        "aggressor_side": trade.aggressor_side,
+        "price_ticks": trade.price_ticks,
+        "quantity_lots": trade.quantity_ticks,
+        "price_scale": PRICE_SCALE,
+        "aggressor_side": trade.aggressor_side.value,
         "maker_order_id": trade.maker_order_id,
         "taker_order_id": trade.taker_order_id
     }
-    await connection_manager.broadcast_trade_execution(symbol, trade_data)
 
-async def broadcast_bbo_update(symbol: str, best_bid: tuple, best_ask: tuple):
-    """Called by matching engine when BBO changes"""
-    bbo_data = {
-        "type": "bbo",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "symbol": symbol,
-        "best_bid": {"price": str(best_bid[0]), "quantity": str(best_bid[1])} if best_bid else None,
-        "best_ask": {"price": str(best_ask[0]), "quantity": str(best_ask[1])} if best_ask else None
-    }
-    await connection_manager.broadcast_market_data(symbol, bbo_data) 
\ No newline at end of file
+async def broadcast_trade_execution(symbol: str, trade):
+    """Called by matching engine when trade executes"""
+    await connection_manager.broadcast_trade_execution(symbol, _trade_message(symbol, trade))
+
+# Per-symbol BBO message skeletons: (message, bid level, ask level). Each update
+# overwrites the leaf values in place instead of rebuilding the nested dicts. This
+# is safe because _broadcast encodes the message before its first await.
+_bbo_templates : Dict[str, Tuple[dict, dict, dict]] = {}
+
+def _bbo_message(symbol: str, best_bid: Optional[Tuple[int, int]], best_ask: Optional[Tuple[int, int]]) -> dict:
+    """
+    BBO feed message. best_bid/best_ask are (price_ticks, quantity_lots) integer
+    pairs at PRICE_SCALE, as kept by OrderBook, and are sent through unchanged.
+    """
+    template = _bbo_templates.get(symbol)
+    if template is None:
+        template = _bbo_templates[symbol] = (
+            {
+                "type": "bbo",
+                "timestamp": None,
+                "symbol": symbol,
+                "best_bid": None,
+                "best_ask": None,
+                "price_scale": PRICE_SCALE
+            },
+            {"price_ticks": 0, "quantity_lots": 0},
+            {"price_ticks": 0, "quantity_lots": 0}
+        )
+    message, bid_level, ask_level = template
+
+    message["timestamp"] = _utc_timestamp()
+    if best_bid:
+        bid_level["price_ticks"], bid_level["quantity_lots"] = best_bid
+        message["best_bid"] = bid_level
+    else:
+        message["best_bid"] = None
+    if best_ask:
+        ask_level["price_ticks"], ask_level["quantity_lots"] = best_ask
+        message["best_ask"] = ask_level
+    else:
+        message["best_ask"] = None
+    return message
+
+async def broadcast_bbo_update(symbol: str, best_bid: Optional[Tuple[int, int]], best_ask: Optional[Tuple[int, int]]):
+    """Called by matching engine when BBO changes; levels are (price_ticks, quantity_lots)"""
+    await connection_manager.broadcast_market_data(symbol, _bbo_message(symbol, best_bid, best_ask))
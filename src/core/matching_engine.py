@@ -1,41 +1,84 @@
 import asyncio
 import logging
-from collections import defaultdict
-from datetime import datetime, timezone
-from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Optional, Callable, Any
-import json
+import sys
+from collections import OrderedDict, deque
+from itertools import islice
+from decimal import InvalidOperation
+from typing import Deque, Dict, List, Optional, Set, Tuple, Callable, Any
 
-from .order import Order, OrderType, OrderSide, OrderStatus
+from .order import Order, OrderType, OrderSide, TERMINAL_STATUSES, format_ticks, utc_now
 from .trade import Trade
 from .orderbook import OrderBook
 
-# configure logging
-logging.basicConfig(level=logging.INFO)
+# Library logging: no handlers or level configured at import; the application
+# decides both. Per-order calls are gated on isEnabledFor, so disabled INFO costs
+# one check per order.
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# The global trade log is a bounded ring buffer; the oldest trades fall off
+# once it is full. Per-symbol history lives on each OrderBook.
+TRADE_LOG_MAXLEN = 1_000_000
+
+# Orders that can no longer change are kept for status lookups up to this
+# many, oldest evicted first
+CLOSED_ORDERS_MAXLEN = 100_000
+
+# Request strings map straight to enum members, in both lower and upper case;
+# one dict lookup replaces the list test, upper() and Enum() call per field
+_ORDER_TYPES = {key: member for member in OrderType for key in (member.value.lower(), member.value)}
+_SIDES = {key: member for member in OrderSide for key in (member.value.lower(), member.value)}
+
+def _lookup(table: dict, value):
+    """Enum member for a request string, or None; mixed case falls back to lower()"""
+    member = table.get(value)
+    if member is None and isinstance(value, str):
+        member = table.get(value.lower())
+    return member
 
 class MatchingEngine:
     """
     Core matching engine for processing orders and executing trades.
+
+    :param per_trade_notifications: publish a market data update plus one
+        trade_execution event per trade, instead of one trade_batch per order
     """
-    def __init__(self):
+    def __init__(self, per_trade_notifications: bool = False):
+        self.per_trade_notifications = per_trade_notifications
+
         # order books for each symbol
         self.order_books: Dict[str, OrderBook] = {}
 
         # trade history
-        self.trades: List[Trade] = []
-        self.trade_history: Dict[str, List[Trade]] = defaultdict(list)
+        self.trades: Deque[Trade] = deque(maxlen=TRADE_LOG_MAXLEN)
 
-        # order tracking
-        self.all_orders : Dict[str, Order] = {}
+        # order tracking: open_orders holds only orders resting in a book, so
+        # it stays as small as the books themselves; finished orders move to
+        # the bounded closed_orders
+        self.open_orders : Dict[str, Order] = {}
+        self.closed_orders : OrderedDict[str, Order] = OrderedDict()
         
         # event callbacks for real-time updates
-        self.market_data_callbacks: List[Callable] = []
-        self.trade_callbacks: List[Callable] = []
+        # (split into sync and async when subscribing, so notifications never
+        # have to inspect a callback). Held as tuples that subscribe replaces,
+        # never mutates, so a notification already iterating one is unaffected
+        self.sync_md_callbacks: Tuple[Callable, ...] = ()
+        self.async_md_callbacks: Tuple[Callable, ...] = ()
+        self.sync_trade_callbacks: Tuple[Callable, ...] = ()
+        self.async_trade_callbacks: Tuple[Callable, ...] = ()
+        # union of both kinds for trade batches, rebuilt on subscribe
+        self._batch_sync_callbacks: Tuple[Callable, ...] = ()
+        self._batch_async_callbacks: Tuple[Callable, ...] = ()
         
         # Performance metrics
         self.total_orders_processed = 0
         self.total_trades_executed = 0
+        self.trade_count_by_symbol: Dict[str, int] = {}
+
+        # Per-symbol statistics entries, rebuilt by get_statistics only for
+        # symbols whose book changed since the last call
+        self._symbol_stats: Dict[str, dict] = {}
+        self._stats_dirty: Set[str] = set()
         
         logger.info("Matching engine initialized")
 
@@ -73,7 +116,9 @@ class MatchingEngine:
         """Get existing order book or create new one for symbol."""
         if symbol not in self.order_books:
             self.order_books[symbol] = OrderBook(symbol)
-            logger.info(f"Created new order book for {symbol}")
+            self.trade_count_by_symbol[symbol] = 0
+            self._stats_dirty.add(symbol)
+            logger.info("Created new order book for %s", symbol)
         return self.order_books[symbol]
     
     async def submit_order(self, order_request : dict) -> dict:
@@ -87,16 +132,20 @@ class MatchingEngine:
             order = self._create_order_from_request(order_request)
             
             # Validate order
-            if order.remaining_quantity <= 0:
+            if order.remaining_ticks <= 0:
                 raise ValueError("Order quantity must be positive")
             
             # get order book
             order_book = self.get_or_create_orderbook(order.symbol)
             
             # store order BEFORE processing (important for order lookup)
-            self.all_orders[order.order_id] = order
+            self.open_orders[order.order_id] = order
             
-            logger.info(f"Processing order {order.order_id}: {order.side.value} {order.remaining_quantity} {order.symbol} @ {order.price}")
+            # Checked once per order; when INFO is off none of the log arguments
+            # below are even computed
+            log_info = logger.isEnabledFor(logging.INFO)
+            if log_info:
+                logger.info("Processing order %s: %s %s %s @ %s", order.order_id, order.side_str, format_ticks(order.remaining_ticks), order.symbol, order.price)
             
             # Process order and get trades
             trades = order_book.add_order(order)
@@ -104,27 +153,52 @@ class MatchingEngine:
             # Update metrics
             self.total_orders_processed += 1
             self.total_trades_executed += len(trades)
+            self.trade_count_by_symbol[order.symbol] += len(trades)
+            self._stats_dirty.add(order.symbol)
 
-            # Store trades
+            # Store trades, retiring makers the trade filled completely
+            recent_trades = order_book.recent_trades
+            open_orders = self.open_orders
             for trade in trades:
                 self.trades.append(trade)
-                self.trade_history[trade.symbol].append(trade)
-                logger.info(f"Trade executed: {trade.quantity} {trade.symbol} @ {trade.price}")
+                recent_trades.append(trade)
+                maker = open_orders.get(trade.maker_order_id)
+                if maker is not None and maker.remaining_ticks == 0:
+                    self._close_order(maker)
+                if log_info:
+                    logger.info("Trade executed: %s %s @ %s", format_ticks(trade.quantity_ticks),
+                                trade.symbol, format_ticks(trade.price_ticks))
+
+            # only a limit order with quantity left rests in the book
+            if order.remaining_ticks == 0 or order.order_type is not OrderType.LIMIT:
+                self._close_order(order)
+
+            # one timestamp for everything published about this order
+            ts_iso = utc_now().isoformat()
+
+            # trade dicts are built once and shared by the response and the batch
+            trade_dicts = [trade.to_dict() for trade in trades]
 
             # notify subscribers
-            await self._notify_market_data_update(order.symbol)
-            for trade in trades:
-                await self._notify_trade_execution(trade)
+            if not trades:
+                await self._notify_market_data_update(order.symbol, ts_iso)
+            elif self.per_trade_notifications:
+                await self._notify_market_data_update(order.symbol, ts_iso)
+                for trade in trades:
+                    await self._notify_trade_execution(trade)
+            else:
+                await self._notify_trades_batch(order.symbol, trade_dicts, ts_iso)
 
             # Enhanced logging
-            if trades:
-                logger.info(f"Order {order.order_id} generated {len(trades)} trades. Status: {order.status.value}, Remaining: {order.remaining_quantity}")
-            else:
-                logger.info(f"Order {order.order_id} added to book. Status: {order.status.value}, Remaining: {order.remaining_quantity}")
+            if log_info:
+                if trades:
+                    logger.info("Order %s generated %d trades. Status: %s, Remaining: %s", order.order_id, len(trades), order.status_str, format_ticks(order.remaining_ticks))
+                else:
+                    logger.info("Order %s added to book. Status: %s, Remaining: %s", order.order_id, order.status_str, format_ticks(order.remaining_ticks))
 
             result = {
                 'order' : order.to_dict(),
-                'trades' : [trade.to_dict() for trade in trades],
+                'trades' : trade_dicts,
                 'status': 'success'
             }
 
@@ -140,7 +214,7 @@ class MatchingEngine:
     async def cancel_order(self, order_id: str) -> dict:
         """Cancel an existing order."""
         try:
-            order = self.all_orders.get(order_id)
+            order = self._find_order(order_id)
             if not order:
                 return {
                     'status': 'error',
@@ -148,10 +222,10 @@ class MatchingEngine:
                 }
             
             # Check if order can be cancelled
-            if order.status in [OrderStatus.FILLED, OrderStatus.CANCELLED]:
+            if order.status & TERMINAL_STATUSES:
                 return {
                     'status': 'error',
-                    'message': f'Order {order_id} cannot be cancelled (status: {order.status.value})'
+                    'message': f'Order {order_id} cannot be cancelled (status: {order.status_str})'
                 }
             
             # Get order book and cancel
@@ -159,7 +233,9 @@ class MatchingEngine:
             if order_book:
                 cancelled = order_book.cancel_order(order_id)
                 if cancelled:
-                    logger.info(f"Cancelled order {order_id}")
+                    self._close_order(order)
+                    self._stats_dirty.add(order.symbol)
+                    logger.info("Cancelled order %s", order_id)
                     await self._notify_market_data_update(order.symbol)
                     
                     return {
@@ -179,23 +255,31 @@ class MatchingEngine:
                 'message': str(e)
             }
     
-    def get_order_book_depth(self, symbol: str, levels: int = 10) -> dict:
-        """Get order book depth for a symbol."""
+    def get_order_book_depth(self, symbol: str, levels: int = 10, ts_iso: Optional[str] = None) -> dict:
+        """
+        Get order book depth for a symbol.
+        ts_iso: timestamp shared by a batch of responses; taken now if omitted
+        """
+        ts_iso = ts_iso or utc_now().isoformat()
         order_book = self.order_books.get(symbol)
         if not order_book:
             return {
                 'symbol': symbol,
                 'bids': [],
                 'asks': [],
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': ts_iso
             }
         
         depth = order_book.get_depth(levels)
-        depth['timestamp'] = datetime.now(timezone.utc).isoformat()
+        depth['timestamp'] = ts_iso
         return depth
     
-    def get_bbo(self, symbol: str) -> dict:
-        """Get Best Bid and Offer for a symbol."""
+    def get_bbo(self, symbol: str, ts_iso: Optional[str] = None) -> dict:
+        """
+        Get Best Bid and Offer for a symbol.
+        ts_iso: timestamp shared by a batch of responses; taken now if omitted
+        """
+        ts_iso = ts_iso or utc_now().isoformat()
         order_book = self.order_books.get(symbol)
         if not order_book:
             return {
@@ -203,7 +287,7 @@ class MatchingEngine:
                 'best_bid': None,
                 'best_ask': None,
                 'spread': None,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': ts_iso
             }
         
         best_bid, best_ask = order_book.get_bbo()
@@ -211,21 +295,26 @@ class MatchingEngine:
         
         return {
             'symbol': symbol,
-            'best_bid': str(best_bid) if best_bid else None,
-            'best_ask': str(best_ask) if best_ask else None,
-            'spread': str(spread) if spread else None,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'best_bid': format_ticks(best_bid) if best_bid is not None else None,
+            'best_ask': format_ticks(best_ask) if best_ask is not None else None,
+            'spread': format_ticks(spread) if spread is not None else None,
+            'timestamp': ts_iso
         }
     
     def get_recent_trades(self, symbol: str, limit: int = 100) -> List[dict]:
         """Get recent trades for a symbol."""
-        trades = self.trade_history.get(symbol, [])
-        recent_trades = trades[-limit:] if trades else []
+        order_book = self.order_books.get(symbol)
+        if not order_book or not order_book.recent_trades:
+            return []
+        trades = order_book.recent_trades
+        # Walk back from the newest trade so only `limit` entries are touched
+        recent_trades = list(islice(reversed(trades), limit))
+        recent_trades.reverse()
         return [trade.to_dict() for trade in recent_trades]
     
     def get_order_status(self, order_id: str) -> dict:
         """Get status of a specific order."""
-        order = self.all_orders.get(order_id)
+        order = self._find_order(order_id)
         if not order:
             return {
                 'status': 'error',
@@ -246,33 +335,68 @@ class MatchingEngine:
             'total_trades_executed': self.total_trades_executed,
             'active_symbols': active_symbols,
             'total_symbols': len(active_symbols),
-            'uptime': datetime.now(timezone.utc).isoformat()
+            'uptime': utc_now().isoformat()
         }
         
+        # Refresh per-symbol stats only where the book changed; the rest are
+        # served from the previous call
+        for symbol in self._stats_dirty:
+            bbo = self.order_books[symbol].get_bbo()
+            self._symbol_stats[symbol] = {
+                f'{symbol}_best_bid': format_ticks(bbo[0]) if bbo[0] is not None else None,
+                f'{symbol}_best_ask': format_ticks(bbo[1]) if bbo[1] is not None else None,
+                f'{symbol}_trades': self.trade_count_by_symbol[symbol]
+            }
+        self._stats_dirty.clear()
+
         # Add per-symbol stats
-        for symbol in active_symbols:
-            order_book = self.order_books[symbol]
-            bbo = order_book.get_bbo()
-            stats[f'{symbol}_best_bid'] = str(bbo[0]) if bbo[0] else None
-            stats[f'{symbol}_best_ask'] = str(bbo[1]) if bbo[1] else None
-            stats[f'{symbol}_trades'] = len(self.trade_history.get(symbol, []))
+        for symbol_stats in self._symbol_stats.values():
+            stats.update(symbol_stats)
         
         return stats
     
     def subscribe_to_market_data(self, callback: Callable):
         """Subscribe to market data updates."""
-        self.market_data_callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self.async_md_callbacks += (callback,)
+        else:
+            self.sync_md_callbacks += (callback,)
+        self._refresh_batch_callbacks()
     
     def subscribe_to_trades(self, callback: Callable):
         """Subscribe to trade execution updates."""
-        self.trade_callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self.async_trade_callbacks += (callback,)
+        else:
+            self.sync_trade_callbacks += (callback,)
+        self._refresh_batch_callbacks()
+
+    def _refresh_batch_callbacks(self):
+        # A callback subscribed to both feeds still gets each batch once
+        self._batch_sync_callbacks = self.sync_md_callbacks + tuple(
+            cb for cb in self.sync_trade_callbacks if cb not in self.sync_md_callbacks)
+        self._batch_async_callbacks = self.async_md_callbacks + tuple(
+            cb for cb in self.async_trade_callbacks if cb not in self.async_md_callbacks)
     
+    def _find_order(self, order_id: str) -> Optional[Order]:
+        """Look up an order, open orders first"""
+        order = self.open_orders.get(order_id)
+        if order is None:
+            order = self.closed_orders.get(order_id)
+        return order
+
+    def _close_order(self, order: Order):
+        """Move a finished order out of the open table into the bounded closed one"""
+        self.open_orders.pop(order.order_id, None)
+        closed_orders = self.closed_orders
+        closed_orders[order.order_id] = order
+        if len(closed_orders) > CLOSED_ORDERS_MAXLEN:
+            closed_orders.popitem(last=False)
+
     def _create_order_from_request(self, request: dict) -> Order:
         """Create Order object from request dictionary."""
         # Required fields
         symbol = request.get('symbol')
-        order_type_str = request.get('order_type', '').lower()
-        side_str = request.get('side', '').lower()
         quantity = request.get('quantity')
         price = request.get('price')
         
@@ -280,68 +404,65 @@ class MatchingEngine:
         if not symbol:
             raise ValueError("Symbol is required")
         
-        # Convert symbol to uppercase for consistency
-        symbol = symbol.upper()
-        
-        if order_type_str not in ['market', 'limit', 'ioc', 'fok']:
-            raise ValueError(f"Invalid order type: {order_type_str}")
+        # Convert symbol to uppercase for consistency; interned so order_books
+        # lookups can short-circuit on identity
+        symbol = sys.intern(symbol.upper())
         
-        if side_str not in ['buy', 'sell']:
-            raise ValueError(f"Invalid side: {side_str}")
+        # Validate and convert to enums in one table lookup each
+        order_type = _lookup(_ORDER_TYPES, request.get('order_type'))
+        if order_type is None:
+            raise ValueError(f"Invalid order type: {request.get('order_type')}")
         
-        if not quantity or quantity <= 0:
-            raise ValueError("Quantity must be positive")
+        side = _lookup(_SIDES, request.get('side'))
+        if side is None:
+            raise ValueError(f"Invalid side: {request.get('side')}")
         
-        # Convert to enums
-        order_type = OrderType(order_type_str.upper())  # Ensure uppercase for enum
-        side = OrderSide(side_str.upper())  # Ensure uppercase for enum
+        if quantity is None:
+            raise ValueError("Quantity is required")
 
-        # Safely convert quantity to Decimal
-        try:
-            decimal_quantity = Decimal(str(quantity))
-            if decimal_quantity <= 0:
-                raise ValueError("Quantity must be greater than zero")
-        except (ValueError, InvalidOperation) as e:
-            logger.error(f"Invalid quantity format: {quantity}, error: {e}")
-            raise ValueError(f"Invalid quantity format: {quantity}")
+        # A client-supplied id must not replace an order the engine still tracks;
+        # generated ids carry a random per-process prefix and never collide
+        order_id = request.get('order_id')
+        if order_id and self._find_order(order_id) is not None:
+            raise ValueError(f"Duplicate order_id: {order_id}")
 
         # Handle price - market orders don't need price
-        decimal_price = None
-        if order_type != OrderType.MARKET:  # Only require price for non-market orders
-            if price is None:
-                raise ValueError(f"Price is required for {order_type_str} orders")
-            try:
-                decimal_price = Decimal(str(price))
-                if decimal_price <= 0:
-                    raise ValueError("Price must be greater than zero")
-            except (ValueError, InvalidOperation) as e:
-                logger.error(f"Invalid price format: {price}, error: {e}")
-                raise ValueError(f"Invalid price format: {price}")
-
-        # Create order
-        order = Order(
-            symbol=symbol,
-            order_type=order_type,
-            side=side,
-            quantity=decimal_quantity,
-            price=decimal_price,
-            order_id=request.get('order_id')  # Optional custom order ID
-        )
+        if order_type is OrderType.MARKET:
+            price = None
+        elif price is None:
+            raise ValueError(f"Price is required for {order_type.value.lower()} orders")
+
+        # Order converts quantity and price straight to integer ticks, so numeric
+        # inputs skip the Decimal(str(x)) roundtrip and strings are parsed once
+        try:
+            order = Order(
+                symbol=symbol,
+                order_type=order_type,
+                side=side,
+                quantity=quantity,
+                price=price,
+                order_id=order_id  # Optional custom order ID
+            )
+        except InvalidOperation:
+            logger.error(f"Invalid quantity or price format: {quantity}, {price}")
+            raise ValueError(f"Invalid quantity or price format: {quantity}, {price}")
         
         # Log order creation for debugging
-        logger.debug(f"Created order: {order.order_id} - {side.value} {decimal_quantity} {symbol} @ {decimal_price}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created order: %s - %s %s %s @ %s", order.order_id, order.side_str, order.quantity, symbol, order.price)
         
         return order
     
-    async def _notify_market_data_update(self, symbol: str):
+    async def _notify_market_data_update(self, symbol: str, ts_iso: Optional[str] = None):
         """Notify all market data subscribers of an update."""
-        if not self.market_data_callbacks:
+        if not (self.sync_md_callbacks or self.async_md_callbacks):
             return
         
         try:
-            # Get updated market data
-            depth_data = self.get_order_book_depth(symbol)
-            bbo_data = self.get_bbo(symbol)
+            # Get updated market data, all stamped with the same time
+            ts_iso = ts_iso or utc_now().isoformat()
+            depth_data = self.get_order_book_depth(symbol, ts_iso=ts_iso)
+            bbo_data = self.get_bbo(symbol, ts_iso)
             
             # Combine data
             market_data = {
@@ -349,25 +470,18 @@ class MatchingEngine:
                 'symbol': symbol,
                 'depth': depth_data,
                 'bbo': bbo_data,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': ts_iso
             }
             
             # Notify all subscribers
-            for callback in self.market_data_callbacks:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(market_data)
-                    else:
-                        callback(market_data)
-                except Exception as e:
-                    logger.error(f"Error in market data callback: {e}")
+            await self._dispatch(self.sync_md_callbacks, self.async_md_callbacks, market_data, "market data")
                     
         except Exception as e:
             logger.error(f"Error notifying market data update: {e}")
 
     async def _notify_trade_execution(self, trade: Trade):
         """Notify all trade subscribers of a new trade."""
-        if not self.trade_callbacks:
+        if not (self.sync_trade_callbacks or self.async_trade_callbacks):
             return
         
         try:
@@ -377,18 +491,53 @@ class MatchingEngine:
             }
             
             # Notify all subscribers
-            for callback in self.trade_callbacks:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(trade_data)
-                    else:
-                        callback(trade_data)
-                except Exception as e:
-                    logger.error(f"Error in trade callback: {e}")
+            await self._dispatch(self.sync_trade_callbacks, self.async_trade_callbacks, trade_data, "trade")
                     
         except Exception as e:
             logger.error(f"Error notifying trade execution: {e}")
 
+    async def _notify_trades_batch(self, symbol: str, trade_dicts: List[dict], ts_iso: str):
+        """
+        Publish all trades from one order together with the resulting depth and BBO.
+        Market data and trade subscribers each get this one payload once, so the
+        depth/BBO walk happens once per order rather than once per trade.
+        """
+        sync_callbacks = self._batch_sync_callbacks
+        async_callbacks = self._batch_async_callbacks
+        if not (sync_callbacks or async_callbacks):
+            return
+        
+        try:
+            batch = {
+                'type': 'trade_batch',
+                'symbol': symbol,
+                'trades': trade_dicts,
+                'depth': self.get_order_book_depth(symbol, ts_iso=ts_iso),
+                'bbo': self.get_bbo(symbol, ts_iso),
+                'timestamp': ts_iso
+            }
+            await self._dispatch(sync_callbacks, async_callbacks, batch, "trade batch")
+
+        except Exception as e:
+            logger.error(f"Error notifying trade batch: {e}")
+
+    async def _dispatch(self, sync_callbacks: Tuple[Callable, ...], async_callbacks: Tuple[Callable, ...], payload: dict, kind: str):
+        """
+        Deliver a payload to every callback. Sync callbacks run inline; async ones
+        run concurrently, and one failing does not stop the others.
+        """
+        for callback in sync_callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Error in {kind} callback: {e}")
+
+        if async_callbacks:
+            results = await asyncio.gather(*(callback(payload) for callback in async_callbacks), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error in {kind} callback: {result}")
+
 # Global matching engine instance
 matching_engine = MatchingEngine()
 
@@ -1,9 +1,59 @@
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional
-from enum import Enum
+from typing import Optional, Union
+from enum import Enum, IntFlag
+import itertools
 import uuid
 
+# Fixed-point scale for integer price ticks / quantity lots (1e-8, one satoshi)
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10**PRICE_DECIMALS
+
+# Below this magnitude value * PRICE_SCALE stays under 2**51, so one float
+# multiply and round() recovers the exact tick count
+_FLOAT_FAST_LIMIT = 2**51 / PRICE_SCALE
+
+def to_ticks(value) -> int:
+    """
+    Convert a price or quantity (Decimal, str, int or float) to integer ticks at
+    PRICE_SCALE. Ints and in-range floats are converted without a Decimal.
+    """
+    if type(value) is int:
+        return value * PRICE_SCALE
+    if type(value) is float and -_FLOAT_FAST_LIMIT < value < _FLOAT_FAST_LIMIT:
+        ticks = round(value * PRICE_SCALE)
+        # round-trips only if the float had at most PRICE_DECIMALS places;
+        # otherwise the Decimal path below reports it
+        if ticks / PRICE_SCALE == value:
+            return ticks
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    ticks = value.scaleb(PRICE_DECIMALS)
+    if not ticks.is_finite() or ticks != ticks.to_integral_value():
+        raise ValueError(f"{value} is not a finite value with at most {PRICE_DECIMALS} decimal places")
+    return int(ticks)
+
+def from_ticks(ticks: int) -> Decimal:
+    """Convert integer ticks back to a Decimal value"""
+    return Decimal(ticks).scaleb(-PRICE_DECIMALS)
+
+def format_ticks(ticks: int) -> str:
+    """Format integer ticks as a fixed-point decimal string for API output"""
+    sign = '-' if ticks < 0 else ''
+    whole, frac = divmod(abs(ticks), PRICE_SCALE)
+    return f"{sign}{whole}.{frac:0{PRICE_DECIMALS}d}"
+
+# Ids only need to be unique within this process, so a counter replaces uuid4.
+# The random per-process prefix keeps generated ids out of reach of client-supplied
+# order ids, which the engine otherwise accepts as given.
+ID_PREFIX = uuid.uuid4().hex[:12]
+_order_ids = itertools.count(1)
+_fill_ids = itertools.count(1)
+
+def utc_now() -> datetime:
+    """Current UTC time; take it once and pass it along to stamp a whole batch"""
+    return datetime.now(timezone.utc)
+
 class OrderType(Enum):
     MARKET = "MARKET"
     LIMIT = "LIMIT"
@@ -14,173 +64,257 @@ class OrderSide(Enum):
     BUY = "BUY"
     SELL = "SELL"
 
-class OrderStatus(Enum):
-    PENDING = "pending"
-    PARTIALLY_FILLED = "partially_filled"
-    FILLED = "filled"
-    CANCELLED = "cancelled"
-    REJECTED = "rejected"
+class OrderStatus(IntFlag):
+    PENDING = 1
+    PARTIALLY_FILLED = 2
+    FILLED = 4
+    CANCELLED = 8
+    REJECTED = 16
+
+# Statuses an order never leaves; test with `status & TERMINAL_STATUSES`
+TERMINAL_STATUSES = OrderStatus.FILLED | OrderStatus.CANCELLED | OrderStatus.REJECTED
+
+# API string for each status (Order.status_str), now that the values are bits
+STATUS_STRINGS = {
+    OrderStatus.PENDING: "pending",
+    OrderStatus.PARTIALLY_FILLED: "partially_filled",
+    OrderStatus.FILLED: "filled",
+    OrderStatus.CANCELLED: "cancelled",
+    OrderStatus.REJECTED: "rejected"
+}
 
 class Order:
+    # No per-instance __dict__: smaller orders and offset-based attribute access
+    __slots__ = (
+        'symbol', 'order_id', 'order_type', 'side',
+        'order_type_str', 'side_str', 'status_str',
+        'is_buy', 'is_sell', 'is_market_order',
+        'quantity_ticks', 'price_ticks', 'filled_ticks', 'remaining_ticks',
+        'status', 'created_at', 'updated_at', 'fills',
+        '_static_dict', '_updated_at_iso', '_prev', '_next'
+    )
+
     def __init__(
             self,
             symbol: str,
             order_type: OrderType,
             side: OrderSide,
-            quantity: Decimal,
-            price: Optional[Decimal] = None,
-            order_id: Optional[str] = None
+            quantity: Union[Decimal, str, int, float],
+            price: Optional[Union[Decimal, str, int, float]] = None,
+            order_id: Optional[str] = None,
+            external_id: bool = False
     ):
+        """
+        external_id: generate a uuid4 order_id instead of a process-local
+        counter id, for ids handed to systems outside this process
+        """
+        # convert once to integer ticks; all arithmetic below stays in ints
+        quantity_ticks = to_ticks(quantity)
+        price_ticks = to_ticks(price) if price is not None else None
+
         # validation
-        if quantity <= 0:
+        if quantity_ticks <= 0:
             raise ValueError("Quantity must be greater than zero")
-        if order_type in [OrderType.LIMIT, OrderType.IOC, OrderType.FOK] and price is None:
+        if order_type is not OrderType.MARKET and price_ticks is None:
             raise ValueError(f"Price must be specified for {order_type.value} orders")
-        if price is not None and price <= 0:
+        if price_ticks is not None and price_ticks <= 0:
             raise ValueError("Price must be greater than zero")
         
         # core attributes
         self.symbol = symbol
-        self.order_id = order_id or str(uuid.uuid4())
+        if order_id:
+            self.order_id = order_id
+        elif external_id:
+            self.order_id = str(uuid.uuid4())
+        else:
+            self.order_id = f"{ID_PREFIX}-O{next(_order_ids)}"
         self.order_type = order_type
         self.side = side
-        self.quantity = Decimal(str(quantity))
-        self.price = Decimal(str(price)) 
+        # side and type never change, so the hot-path checks are plain attributes
+        self.is_buy = side is OrderSide.BUY
+        self.is_sell = side is OrderSide.SELL
+        self.is_market_order = order_type is OrderType.MARKET
+        # enum .value strings read once here instead of on every log line and dict
+        self.order_type_str = order_type.value
+        self.side_str = side.value
+        self.quantity_ticks = quantity_ticks
+        self.price_ticks = price_ticks
 
         # state tracking
-        self.filled_quantity = Decimal('0.0')
-        self.remaining_quantity = self.quantity
+        self.filled_ticks = 0
+        self.remaining_ticks = quantity_ticks
         self.status = OrderStatus.PENDING
+        self.status_str = STATUS_STRINGS[OrderStatus.PENDING]  # kept in step with status
 
         # timestamps
-        self.created_at = datetime.now(timezone.utc)
+        self.created_at = utc_now()
         self.updated_at = self.created_at
+        self._updated_at_iso = self.created_at.isoformat()
 
         # for matching engine
         self.fills = []  # List to track fills
+        # neighbours in the resting PriceLevel queue, owned by the order book
+        self._prev: Optional["Order"] = None
+        self._next: Optional["Order"] = None
+
+        # to_dict fields that never change after construction, formatted once
+        self._static_dict = {
+            'order_id': self.order_id,
+            'symbol': symbol,
+            'type': self.order_type_str,
+            'side': self.side_str,
+            'quantity': format_ticks(quantity_ticks),
+            'price': format_ticks(price_ticks) if price_ticks is not None else None,
+            'created_at': self._updated_at_iso
+        }
 
+    # Decimal views of the tick fields, for callers that still work in Decimal
     @property
-    def is_buy(self) -> bool:
-        return self.side == OrderSide.BUY
-    
+    def quantity(self) -> Decimal:
+        return from_ticks(self.quantity_ticks)
+
     @property
-    def is_sell(self) -> bool:
-        return self.side == OrderSide.SELL
-    
+    def price(self) -> Optional[Decimal]:
+        return from_ticks(self.price_ticks) if self.price_ticks is not None else None
+
     @property
-    def is_market_order(self) -> bool:
-        return self.order_type == OrderType.MARKET
-    
+    def filled_quantity(self) -> Decimal:
+        return from_ticks(self.filled_ticks)
+
+    @property
+    def remaining_quantity(self) -> Decimal:
+        return from_ticks(self.remaining_ticks)
+
     @property
     def is_limit_order(self) -> bool:
-        return self.order_type == OrderType.LIMIT
+        return self.order_type is OrderType.LIMIT
     
     @property
     def is_ioc_order(self) -> bool:
-        return self.order_type == OrderType.IOC
+        return self.order_type is OrderType.IOC
     
     @property
     def is_fok_order(self) -> bool:
-        return self.order_type == OrderType.FOK
+        return self.order_type is OrderType.FOK
     
     @property
     def is_filled(self) -> bool:
-        return self.remaining_quantity == 0
+        return self.remaining_ticks == 0
     
     @property
     def is_partially_filled(self) -> bool:
-        return 0 < self.filled_quantity < self.quantity
+        return 0 < self.filled_ticks < self.quantity_ticks
     
-    def can_match_with_price(self, other_price : Decimal) -> bool:
+    def can_match_with_price(self, other_ticks : int) -> bool:
         """ 
         check if this order can be matched with another order based on price.
+        other_ticks is the other order's price in integer ticks.
         """
 
+        # plain bool attributes set at construction; no property or enum compare
         if self.is_market_order:
             return True
-        if self.is_buy:
-            return self.price >= other_price
-        else: # sell
-            return self.price <= other_price
+        return self.price_ticks >= other_ticks if self.is_buy else self.price_ticks <= other_ticks
         
-    def fill(self, quantity: Decimal, price: Decimal) -> None:
+    def fill(self, quantity: Decimal, price: Decimal, timestamp: Optional[datetime] = None) -> "Fill":
         """
-        Fill the order with a specified quantity.
+        Fill the order with a specified Decimal quantity and price.
+        """
+        return self.fill_ticks(to_ticks(quantity), to_ticks(price), timestamp)
+
+    def fill_ticks(self, quantity_ticks: int, price_ticks: int, timestamp: Optional[datetime] = None) -> "Fill":
         """
-        if quantity <= 0:
+        Fill the order with a quantity and price given in integer ticks.
+        Callers filling several orders at once may pass one shared timestamp.
+        """
+        if quantity_ticks <= 0:
             raise ValueError("fill quantity must be greater than zero")
-        if quantity > self.remaining_quantity:
+        if quantity_ticks > self.remaining_ticks:
             raise ValueError("fill quantity exceeds remaining quantity")
         
         # create a fill record
         fill = Fill(
             order_id = self.order_id,
-            quantity = quantity,
-            price = price,
-            timestamp = datetime.now(timezone.utc)
+            quantity_ticks = quantity_ticks,
+            price_ticks = price_ticks,
+            timestamp = timestamp or utc_now()
         )
 
         # update order state
-        self.filled_quantity += quantity
-        self.remaining_quantity -= quantity
-        self.updated_at = fill.timestamp
+        self.filled_ticks += quantity_ticks
+        self.remaining_ticks -= quantity_ticks
+        self._set_updated_at(fill.timestamp)
         self.fills.append(fill)
 
         # update status
-        if self.remaining_quantity == 0:
+        if self.remaining_ticks == 0:
             self.status = OrderStatus.FILLED
+            self.status_str = STATUS_STRINGS[OrderStatus.FILLED]
         else:
             self.status = OrderStatus.PARTIALLY_FILLED
+            self.status_str = STATUS_STRINGS[OrderStatus.PARTIALLY_FILLED]
         return fill
     
-    def cancel(self) -> None:
-        if self.status in [OrderStatus.FILLED, OrderStatus.CANCELLED]:
-            raise ValueError(f"Cannot cancel an order that is {self.status.value}")
+    def cancel(self, timestamp: Optional[datetime] = None) -> None:
+        if self.status & TERMINAL_STATUSES:
+            raise ValueError(f"Cannot cancel an order that is {self.status_str}")
         self.status = OrderStatus.CANCELLED
-        self.updated_at = datetime.now(timezone.utc)
+        self.status_str = STATUS_STRINGS[OrderStatus.CANCELLED]
+        self._set_updated_at(timestamp or utc_now())
+
+    def _set_updated_at(self, timestamp: datetime) -> None:
+        # to_dict reads the cached string, so it is refreshed only on state changes
+        self.updated_at = timestamp
+        self._updated_at_iso = timestamp.isoformat()
     
     def to_dict(self) -> dict:
         """
-        convert the order to a dictionary for API responses
+        convert the order to a dictionary for API responses; ticks are formatted
+        back to decimal strings only here, and the immutable fields come from
+        the template built at construction
         """
-        return{
-            'order_id': self.order_id,
-            'symbol': self.symbol,
-            'type': self.order_type.value,
-            'side': self.side.value,
-            'quantity': str(self.quantity),
-            'price': str(self.price) if self.price else None,
-            'filled_quantity': str(self.filled_quantity),
-            'remaining_quantity': str(self.remaining_quantity),
-            'status': self.status.value,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+        return {
+            **self._static_dict,
+            'filled_quantity': format_ticks(self.filled_ticks),
+            'remaining_quantity': format_ticks(self.remaining_ticks),
+            'status': self.status_str,
+            'updated_at': self._updated_at_iso
         }
     
     def __str__(self) -> str:
-        price_str = f"@{self.price}" if self.price else "MARKET"
-        return f"{self.side.value.upper()} {self.quantity} {self.symbol} {price_str} ({self.status.value})"
+        price_str = f"@{format_ticks(self.price_ticks)}" if self.price_ticks is not None else "MARKET"
+        return f"{self.side_str} {format_ticks(self.quantity_ticks)} {self.symbol} {price_str} ({self.status_str})"
     
     def __repr__(self) -> str:
-        return f"Order({self.order_id[:8]}...)"
+        return f"Order({self.order_id})"
     
 class Fill:
     """
     represents a fill aka partial or complete execution of an order
     """
-    def __init__(self, order_id: str, quantity: Decimal, price: Decimal, timestamp: datetime):
-        self.fill_id = str(uuid.uuid4())
+    __slots__ = ('fill_id', 'order_id', 'quantity_ticks', 'price_ticks', 'timestamp')
+
+    def __init__(self, order_id: str, quantity_ticks: int, price_ticks: int, timestamp: datetime):
+        self.fill_id = f"{ID_PREFIX}-F{next(_fill_ids)}"
         self.order_id = order_id
-        self.quantity = Decimal(str(quantity))
-        self.price = Decimal(str(price))
+        self.quantity_ticks = quantity_ticks
+        self.price_ticks = price_ticks
         self.timestamp = timestamp
+
+    @property
+    def quantity(self) -> Decimal:
+        return from_ticks(self.quantity_ticks)
+
+    @property
+    def price(self) -> Decimal:
+        return from_ticks(self.price_ticks)
     
     def to_dict(self) -> dict:
         return {
             'fill_id': self.fill_id,
             'order_id': self.order_id,
-            'quantity': str(self.quantity),
-            'price': str(self.price),
+            'quantity': format_ticks(self.quantity_ticks),
+            'price': format_ticks(self.price_ticks),
             'timestamp': self.timestamp.isoformat()
         }
 
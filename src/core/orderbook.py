@@ -1,74 +1,120 @@
-from collections import defaultdict, deque
-from decimal import Decimal
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Optional, Tuple, Deque
-import heapq
 import logging
-from .order import Order, OrderType, OrderSide, OrderStatus
+import sys
+from sortedcontainers import SortedList
+from .order import Order, OrderType, OrderSide, OrderStatus, format_ticks, utc_now
 from .trade import Trade
 
 class PriceLevel:
     """
     Represents a price level in the order book.
-    Contains a priority queue of orders at that price.
+    Orders queue in time priority on an intrusive doubly-linked list threaded
+    through Order._prev/_next, so any order can be unlinked in O(1) on cancel.
+    Price and total quantity are integer ticks (see order.PRICE_SCALE).
     """
-    def __init__(self, price: Decimal):
+    __slots__ = ('price', 'head', 'tail', 'count', 'total_quantity')
+
+    def __init__(self, price: int):
         self.price = price
-        self.orders: Deque[Order] = deque()  # fifo queue for time priority
-        self.total_quantity: Decimal = Decimal('0.0')
+        self.head: Optional[Order] = None  # oldest order, matched first
+        self.tail: Optional[Order] = None  # newest order
+        self.count: int = 0
+        self.total_quantity: int = 0
 
     def add_order(self, order: Order):
         """Add an order to this price level."""
-        self.orders.append(order)
-        self.total_quantity += order.remaining_quantity
+        tail = self.tail
+        order._prev = tail
+        order._next = None
+        if tail is None:
+            self.head = order
+        else:
+            tail._next = order
+        self.tail = order
+        self.count += 1
+        self.total_quantity += order.remaining_ticks
 
     def remove_order(self, order: Order):
         """Remove an order from this price level. returns true if found and removed"""
-        try:
-            self.orders.remove(order)
-            self.total_quantity -= order.remaining_quantity
-            return True 
-        except ValueError:
+        # a linked order either has a predecessor or is the head
+        prev = order._prev
+        if prev is None and self.head is not order:
             return False
+        nxt = order._next
+        if prev is None:
+            self.head = nxt
+        else:
+            prev._next = nxt
+        if nxt is None:
+            self.tail = prev
+        else:
+            nxt._prev = prev
+        order._prev = order._next = None
+        self.count -= 1
+        self.total_quantity -= order.remaining_ticks
+        return True
         
     def get_first_order(self) -> Optional[Order]:
         """Get the oldest order without removing it"""
-        if self.orders:
-            return self.orders[0]
-        return None
+        return self.head
         
     def is_empty(self) -> bool:
-        return len(self.orders) == 0
+        return self.head is None
 
     def pop_first_order(self) -> Optional[Order]:
-        if self.orders:
-            order = self.orders.popleft()
-            self.total_quantity -= order.remaining_quantity
-            return order
-        return None
+        order = self.head
+        if order is not None:
+            nxt = order._next
+            self.head = nxt
+            if nxt is None:
+                self.tail = None
+            else:
+                nxt._prev = None
+            order._next = None
+            self.count -= 1
+            self.total_quantity -= order.remaining_ticks
+        return order
     
 logger = logging.getLogger(__name__)
 
+# Recent trades kept per order book; the oldest fall off beyond this
+RECENT_TRADES_MAXLEN = 100_000
+
 class OrderBook:
     """
     order book with price-time priority matching
-        Uses heaps for efficient best price access and price levels for FIFO ordering.
+        Uses sorted price indexes for best price access and price levels for FIFO ordering.
+        All prices and quantities, including those on trades, are integer ticks;
+        they are formatted to decimal strings only in get_depth.
     """
     def __init__(self, symbol: str):
         self.symbol = symbol
         # price levels: using dict for O(1) access by price
-        self.bid_levels: Dict[Decimal, PriceLevel] = {} # buy orders
-        self.ask_levels: Dict[Decimal, PriceLevel] = {} # sell orders
+        self.bid_levels: Dict[int, PriceLevel] = {} # buy orders
+        self.ask_levels: Dict[int, PriceLevel] = {} # sell orders
 
-        # heaps for best price access
-        self.bid_prices: List[Decimal] = []  # max-heap for bids
-        self.ask_prices: List[Decimal] = []
+        # sorted indexes of the prices that have a level, kept in step with the
+        # level dicts: best bid is bid_prices[-1], best ask is ask_prices[0]
+        self.bid_prices: SortedList = SortedList()
+        self.ask_prices: SortedList = SortedList()
 
-        # order lookup for fast access
+        # resting orders only, for cancel lookup; an order leaves this map when
+        # it fills or is cancelled, so the map stays the size of the book
         self.orders: Dict[str, Order] = {}  # order_id -> Order
         
-        # best bid/offer cache
-        self._best_bid: Optional[Decimal] = None
-        self._best_ask: Optional[Decimal] = None
+        # best bid/offer cache, updated whenever a level is created or removed
+        self._best_bid: Optional[int] = None
+        self._best_ask: Optional[int] = None
+
+        # (bids, asks) formatted by get_depth, per requested level count; cleared
+        # whenever the book changes, so repeated snapshots of an unchanged book
+        # reuse the same lists
+        self._depth_cache: Dict[int, Tuple[List[List[str]], List[List[str]]]] = {}
+
+        # trade history for this symbol, filled in by the matching engine
+        self.recent_trades: Deque[Trade] = deque(maxlen=RECENT_TRADES_MAXLEN)
 
     def add_order(self, order: Order) -> List[Trade]:
         """
@@ -77,16 +123,22 @@ class OrderBook:
         if order.symbol != self.symbol:
             raise ValueError(f"Order symbol {order.symbol} does not match order book symbol {self.symbol}")
         
-        # store order for lookup
-        self.orders[order.order_id] = order
-        # check if order is marketable
+        # check if order is marketable against the cached opposing best price
         trades = []
-        if self._is_marketable(order):
+        is_buy = order.is_buy
+        opposing_best = self._best_ask if is_buy else self._best_bid
+        if order.is_market_order or (
+                opposing_best is not None
+                and (order.price_ticks >= opposing_best if is_buy else order.price_ticks <= opposing_best)):
             trades = self._match_order(order)
+            if trades:
+                self._depth_cache.clear()
         
         # add remaining quantity to book if its resting order type
-        if order.remaining_quantity > 0 and order.order_type in [OrderType.LIMIT]:
+        if order.remaining_ticks > 0 and order.order_type is OrderType.LIMIT:
             self._add_to_book(order)
+            self.orders[order.order_id] = order
+            self._depth_cache.clear()
         
         return trades
     
@@ -97,147 +149,145 @@ class OrderBook:
             return False
         removed = self._remove_from_book(order)
         if removed:
+            self.orders.pop(order_id, None)
+            self._depth_cache.clear()
             order.cancel()
             return True
         return False
     
-    def get_best_bid(self) -> Optional[Decimal]:
-        """Get the highest bid price."""
-        self._update_best_prices()
+    def get_best_bid(self) -> Optional[int]:
+        """Get the highest bid price, in ticks."""
         return self._best_bid
     
-    def get_best_ask(self) -> Optional[Decimal]:
-        """Get the lowest ask price."""
-        self._update_best_prices()
+    def get_best_ask(self) -> Optional[int]:
+        """Get the lowest ask price, in ticks."""
         return self._best_ask
     
-    def get_spread(self) -> Optional[Decimal]:
-        """Get the bid-ask spread."""
-        bid = self.get_best_bid()
-        ask = self.get_best_ask()
-        if bid and ask:
+    def get_spread(self) -> Optional[int]:
+        """Get the bid-ask spread, in ticks."""
+        bid = self._best_bid
+        ask = self._best_ask
+        if bid is not None and ask is not None:
             return ask - bid
         return None
     
-    def get_bbo(self) -> Tuple[Optional[Decimal], Optional[Decimal]]:
-        """Get Best Bid and Offer (BBO)."""
-        return self.get_best_bid(), self.get_best_ask()
+    def get_bbo(self) -> Tuple[Optional[int], Optional[int]]:
+        """Get Best Bid and Offer (BBO), in ticks."""
+        return self._best_bid, self._best_ask
     
     def get_depth(self, levels: int = 10) -> Dict:
         """
-        get order book depth upto specified levels
+        get order book depth upto specified levels.
+        The bids/asks lists are cached until the book changes and shared
+        between callers, so treat them as read-only.
         """
-        self._update_best_prices()
+        cached = self._depth_cache.get(levels)
+        if cached is None:
+            # The price indexes are already sorted and hold only non-empty levels,
+            # so depth walks just the first `levels` entries of each side
+            bid_levels = self.bid_levels
+            ask_levels = self.ask_levels
 
-        # get bid levels
-        bids = []
-        bid_prices_sorted = sorted([p for p in self.bid_levels.keys() if not self.bid_levels[p].is_empty()], reverse=True)
-        for price in bid_prices_sorted[:levels]:
-            level = self.bid_levels[price]
-            bids.append([str(price), str(level.total_quantity)])
+            # get bid levels
+            bids = [[format_ticks(price), format_ticks(bid_levels[price].total_quantity)]
+                    for price in islice(reversed(self.bid_prices), levels)]
+
+            # get ask levels
+            asks = [[format_ticks(price), format_ticks(ask_levels[price].total_quantity)]
+                    for price in islice(self.ask_prices, levels)]
+            self._depth_cache[levels] = (bids, asks)
+        else:
+            bids, asks = cached
 
-        # get ask levels
-        asks = []
-        ask_prices_sorted = sorted([p for p in self.ask_levels.keys() if not self.ask_levels[p].is_empty()])
-        for price in ask_prices_sorted[:levels]:
-            level = self.ask_levels[price]
-            asks.append([str(price), str(level.total_quantity)])
-        
         return {
             'symbol': self.symbol,
             'bids': bids,
             'asks': asks
         }
 
-    def _is_marketable(self, order: Order) -> bool:
-        """check if an order can be matched immediately"""
-        if order.is_market_order:
-            return True
-        
-        best_bid = self.get_best_bid()
-        best_ask = self.get_best_ask()
-        if order.is_buy and best_ask and order.price >= best_ask:
-            return True
-        elif order.is_sell and best_bid and order.price <= best_bid:
-            return True
-        
-        return False
-    
     def _match_order(self, incoming_order : Order) -> List[Trade]:
         """
         Match an incoming order against the book.
         Implements price-time priority and internal order protection.
         """
         trades = []
-        
-        if incoming_order.is_buy:
-            # match against asks(sell orders)
-            opposing_levels = self.ask_levels
-            opposing_prices = self.ask_prices
-            price_comparator = lambda price : price <= (incoming_order.price or Decimal('inf'))
+        # every trade and fill from this one incoming order shares a timestamp
+        now = utc_now()
+
+        # fixed for the whole match, so read once instead of per level; the
+        # opposing side's best price is always at best_index of its index
+        is_buy = incoming_order.is_buy
+        if is_buy:
+            opposing_levels, opposing_prices, best_index = self.ask_levels, self.ask_prices, 0
         else:
-            # match against bids(buy orders)
-            opposing_levels = self.bid_levels
-            opposing_prices = self.bid_prices
-            price_comparator = lambda price : price >= (incoming_order.price or Decimal('0.0'))
+            opposing_levels, opposing_prices, best_index = self.bid_levels, self.bid_prices, -1
+        # a market order takes any price: its limit is past every real price
+        if incoming_order.is_market_order:
+            limit = sys.maxsize if is_buy else 0
+        else:
+            limit = incoming_order.price_ticks
 
-        # Continue matching while there are opposing orders and incoming order has remaining quantity
-        while incoming_order.remaining_quantity > 0:
-            # get best opposing price level
-            best_price = self._get_best_opposing_price(incoming_order.is_buy)
-            if not best_price:
-                break
+        # Walk the opposing levels best-first while the incoming order has quantity left
+        while incoming_order.remaining_ticks > 0 and opposing_prices:
+            best_price = opposing_prices[best_index]
 
             # check if match at this price is possible
-            if not incoming_order.is_market_order and not price_comparator(best_price):
+            if (best_price > limit) if is_buy else (best_price < limit):
                 break
 
-            # get the price level
+            # every indexed level holds at least one order
             price_level = opposing_levels[best_price]
-            if price_level.is_empty():
-                self._remove_price_level(best_price, incoming_order.is_buy)
-                continue
 
             # match with orders at this price level
-            while not price_level.is_empty() and incoming_order.remaining_quantity > 0:
-                resting_order = price_level.get_first_order()
-                if not resting_order:
+            while incoming_order.remaining_ticks > 0:
+                resting_order = price_level.head
+                if resting_order is None:
                     break
 
-                # figure out the trade quantity
-                trade_quantity = min(incoming_order.remaining_quantity, resting_order.remaining_quantity)
-                trade_price = resting_order.price
+                # figure out the trade quantity, all in integer ticks
+                trade_quantity = min(incoming_order.remaining_ticks, resting_order.remaining_ticks)
+                trade_price = resting_order.price_ticks
 
                 trade = Trade(
                     symbol=self.symbol,
-                    price=trade_price,
-                    quantity=trade_quantity,
+                    price_ticks=trade_price,
+                    quantity_ticks=trade_quantity,
                     maker_order_id=resting_order.order_id,  # resting order
                     taker_order_id=incoming_order.order_id,  # incoming order
-                    aggressor_side=incoming_order.side  # side of the incoming order
+                    aggressor_side=incoming_order.side,  # side of the incoming order
+                    timestamp=now
                 )
                 trades.append(trade)
 
                 # fill both orders
-                resting_order.fill(trade_quantity, trade_price)
-                incoming_order.fill(trade_quantity, trade_price)
+                resting_order.fill_ticks(trade_quantity, trade_price, now)
+                incoming_order.fill_ticks(trade_quantity, trade_price, now)
 
-                # remove resting order if fully filled
-                if resting_order.is_filled:
+                # the level total drops by every fill; a filled resting order
+                # then leaves the queue with nothing more to subtract
+                price_level.total_quantity -= trade_quantity
+                if resting_order.remaining_ticks == 0:
                     price_level.pop_first_order()
-                else:
-                    price_level.total_quantity -= trade_quantity
-            
-            if price_level.is_empty():
-                self._remove_empty_price_level(best_price, incoming_order.is_buy)
-            
-        
+                    self.orders.pop(resting_order.order_id, None)
+
+            if price_level.head is None:
+                # the level is exhausted; drop it here and move on to the next
+                del opposing_levels[best_price]
+                opposing_prices.pop(best_index)
+
+        # refresh the opposing side's cached best price once, after the sweep
+        best_price = opposing_prices[best_index] if opposing_prices else None
+        if is_buy:
+            self._best_ask = best_price
+        else:
+            self._best_bid = best_price
+
         # handle IOC and FOK orders
-        if incoming_order.order_type == OrderType.IOC and incoming_order.remaining_quantity > 0:
+        if incoming_order.order_type is OrderType.IOC and incoming_order.remaining_ticks > 0:
             # cancel remaining quantity
-            incoming_order.cancel()
-        elif incoming_order.order_type == OrderType.FOK and not incoming_order.is_filled:
-            incoming_order.cancel()
+            incoming_order.cancel(now)
+        elif incoming_order.order_type is OrderType.FOK and not incoming_order.is_filled:
+            incoming_order.cancel(now)
         return trades
     
     def _add_to_book(self, order: Order):
@@ -249,18 +299,22 @@ class OrderBook:
             levels = self.ask_levels
             prices = self.ask_prices
         
-        price = order.price
+        price = order.price_ticks
         
-        # Create price level if it doesn't exist
-        if price not in levels:
-            levels[price] = PriceLevel(price)
+        # Create price level if it doesn't exist; one dict lookup either way
+        level = levels.get(price)
+        if level is None:
+            level = levels[price] = PriceLevel(price)
+            prices.add(price)
+            # a new level can only improve the best price on its own side
             if order.is_buy:
-                heapq.heappush(prices, -price)  # Negative for max-heap
-            else:
-                heapq.heappush(prices, price)
+                if self._best_bid is None or price > self._best_bid:
+                    self._best_bid = price
+            elif self._best_ask is None or price < self._best_ask:
+                self._best_ask = price
         
         # Add order to price level
-        levels[price].add_order(order)
+        level.add_order(order)
     
     def _remove_from_book(self, order: Order) -> bool:
         """Remove order from the book."""
@@ -269,9 +323,9 @@ class OrderBook:
         else:
             levels = self.ask_levels
         
-        price = order.price
-        if price in levels:
-            level = levels[price]
+        price = order.price_ticks
+        level = levels.get(price)
+        if level is not None:
             removed = level.remove_order(order)
             
             # Remove empty price level
@@ -282,43 +336,17 @@ class OrderBook:
         
         return False
     
-    def _get_best_opposing_price(self, is_buy_order: bool) -> Optional[Decimal]:
-        """Get the best price on the opposing side."""
-        if is_buy_order:
-            return self.get_best_ask()
-        else:
-            return self.get_best_bid()
-    
-    def _remove_empty_price_level(self, price: Decimal, from_buy_side: bool):
-        """Remove empty price level and update heaps."""
+    def _remove_empty_price_level(self, price: int, from_buy_side: bool):
+        """Remove empty price level and its entry in the price index."""
+        # the cached best price moves only when its own level goes away; the
+        # next one is then the end of the sorted index
         if from_buy_side:
-            if price in self.bid_levels:
-                del self.bid_levels[price]
+            if self.bid_levels.pop(price, None) is not None:
+                self.bid_prices.discard(price)
+                if price == self._best_bid:
+                    self._best_bid = self.bid_prices[-1] if self.bid_prices else None
         else:
-            if price in self.ask_levels:
-                del self.ask_levels[price]
-        
-        # Note: We don't remove from heaps immediately for performance
-        # Instead, we handle empty levels when accessing the heap
-    
-    def _update_best_prices(self):
-        """Update cached best bid and ask prices."""
-        # Update best bid (highest buy price)
-        self._best_bid = None
-        while self.bid_prices:
-            price = -self.bid_prices[0]  # Convert back from negative
-            if price in self.bid_levels and not self.bid_levels[price].is_empty():
-                self._best_bid = price
-                break
-            else:
-                heapq.heappop(self.bid_prices)  # Remove stale price
-        
-        # Update best ask (lowest sell price)
-        self._best_ask = None
-        while self.ask_prices:
-            price = self.ask_prices[0]
-            if price in self.ask_levels and not self.ask_levels[price].is_empty():
-                self._best_ask = price
-                break
-            else:
-                heapq.heappop(self.ask_prices)  # Remove stale price
+            if self.ask_levels.pop(price, None) is not None:
+                self.ask_prices.discard(price)
+                if price == self._best_ask:
+                    self._best_ask = self.ask_prices[0] if self.ask_prices else None
@@ -1,48 +1,69 @@
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
-import uuid
-from .order import OrderSide
+import itertools
+from .order import ID_PREFIX, OrderSide, format_ticks, from_ticks
+
+# Process-local trade ids, like order and fill ids
+_trade_ids = itertools.count(1)
 
 class Trade:
     """
-    represents a trade execution between two orders
+    represents a trade execution between two orders.
+    Price and quantity are integer ticks (see order.PRICE_SCALE), as on Fill.
     """
+    __slots__ = (
+        'trade_id', 'symbol', 'price_ticks', 'quantity_ticks',
+        'maker_order_id', 'taker_order_id', 'aggressor_side', 'timestamp'
+    )
+
     def __init__(
         self,
         symbol: str,
-        price: Decimal,
-        quantity: Decimal,
+        price_ticks: int,
+        quantity_ticks: int,
         maker_order_id: str, # passive order which was resting in the book
         taker_order_id: str, # aggressive order which took the passive order
         aggressor_side: OrderSide, # side of the incoming order (taker), buy or sell
         trade_id: Optional[str] = None,
         timestamp: Optional[datetime] = None
     ):
-        self.trade_id = trade_id or str(uuid.uuid4())
+        self.trade_id = trade_id or f"{ID_PREFIX}-T{next(_trade_ids)}"
         self.symbol = symbol
-        self.price = Decimal(str(price))
-        self.quantity = Decimal(str(quantity))
+        self.price_ticks = price_ticks
+        self.quantity_ticks = quantity_ticks
         self.maker_order_id = maker_order_id  # The resting order
         self.taker_order_id = taker_order_id  # The incoming order
         self.aggressor_side = aggressor_side  # Side of the incoming order
         self.timestamp = timestamp or datetime.now(timezone.utc)
+
+    # Decimal views of the tick fields, for callers that still work in Decimal
+    @property
+    def price(self) -> Decimal:
+        return from_ticks(self.price_ticks)
+
+    @property
+    def quantity(self) -> Decimal:
+        return from_ticks(self.quantity_ticks)
     
     def to_dict(self) -> dict:
-        """Convert trade to dictionary for API responses and WebSocket streaming."""
+        """
+        Convert trade to dictionary for API responses and WebSocket streaming.
+        Every value is JSON-ready, like Order.to_dict and Fill.to_dict.
+        """
         return {
             'timestamp': self.timestamp.isoformat(),
             'symbol': self.symbol,
             'trade_id': self.trade_id,
-            'price': str(self.price),
-            'quantity': str(self.quantity),
+            'price': format_ticks(self.price_ticks),
+            'quantity': format_ticks(self.quantity_ticks),
             'aggressor_side': self.aggressor_side.value,
             'maker_order_id': self.maker_order_id,
             'taker_order_id': self.taker_order_id
         }
     
     def __str__(self) -> str:
-        return f"Trade: {self.quantity} {self.symbol} @ {self.price} ({self.aggressor_side.value} aggressor)"
+        return f"Trade: {format_ticks(self.quantity_ticks)} {self.symbol} @ {format_ticks(self.price_ticks)} ({self.aggressor_side.value} aggressor)"
     
     def __repr__(self) -> str:
-        return f"Trade({self.trade_id[:8]}...)"
\ No newline at end of file
+        return f"Trade({self.trade_id})"
\ No newline at end of file
@@ -3,7 +3,11 @@ import httpx
 import asyncio
 from fastapi.testclient import TestClient
 from src.api.rest_api import create_rest_api
+from src.api.websocket_api import ConnectionManager, _bbo_message, _order_book_message
 from src.core.matching_engine import MatchingEngine
+from fastapi import FastAPI
+from src.core.order import PRICE_SCALE, Order, OrderSide, OrderType
+from src.core.orderbook import OrderBook
 
 class TestRestAPI:
     
@@ -72,3 +76,124 @@ class TestRestAPI:
         
         response = client.post('/api/v1/orders', json=invalid_order)
         assert response.status_code == 400
+
+class TestAppEngineBinding:
+
+    @pytest.mark.asyncio
+    async def test_apps_keep_their_own_engines(self):
+        """Two apps built in one process each serve the engine they were given"""
+        first_engine, second_engine = MatchingEngine(), MatchingEngine()
+        first_app = create_rest_api(FastAPI(), first_engine)
+        second_app = create_rest_api(FastAPI(), second_engine)
+
+        order_data = {
+            'symbol': 'BTC-USDT',
+            'side': 'buy',
+            'order_type': 'limit',
+            'quantity': '1.0',
+            'price': '50000.00'
+        }
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=first_app), base_url='http://test') as first, \
+                httpx.AsyncClient(transport=httpx.ASGITransport(app=second_app), base_url='http://test') as second:
+            response = await first.post('/orders', json=order_data)
+            assert response.status_code == 200
+
+            assert len(first_engine.open_orders) == 1
+            assert not second_engine.open_orders
+            assert (await first.get('/market-data/BTC-USDT/depth')).json()['bids'] == [['50000.00000000', '1.00000000']]
+            assert (await second.get('/market-data/BTC-USDT/depth')).json()['bids'] == []
+            assert (await first.get('/statistics')).json()['total_orders_processed'] == 1
+            assert (await second.get('/statistics')).json()['total_orders_processed'] == 0
+
+class TestWebSocketMessages:
+
+    def test_bbo_message_passes_ticks_through(self):
+        """BBO levels are already integer ticks and are not scaled again"""
+        message = _bbo_message('BTC-USDT', (50000 * PRICE_SCALE, PRICE_SCALE), None)
+
+        assert message['best_bid'] == {'price_ticks': 50000 * PRICE_SCALE, 'quantity_lots': PRICE_SCALE}
+        assert message['best_ask'] is None
+        assert message['price_scale'] == PRICE_SCALE
+
+    def test_order_book_message_sends_tick_levels(self):
+        """Order book levels go out as [price_ticks, quantity_lots] ints, best first"""
+        book = OrderBook('BTC-USDT')
+        book.add_order(Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, 1, 49999))
+        book.add_order(Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, 2, 50000))
+        book.add_order(Order('BTC-USDT', OrderType.LIMIT, OrderSide.SELL, 3, 50100))
+
+        message = _order_book_message('BTC-USDT', book)
+
+        assert message['bids'] == [[50000 * PRICE_SCALE, 2 * PRICE_SCALE], [49999 * PRICE_SCALE, PRICE_SCALE]]
+        assert message['asks'] == [[50100 * PRICE_SCALE, 3 * PRICE_SCALE]]
+        assert message['price_scale'] == PRICE_SCALE
+
+class _FakeWebSocket:
+    """Stand-in subscriber that records what the manager does to it"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_bytes(self, payload):
+        if self.fail:
+            raise RuntimeError("send failed")
+        self.sent.append(payload)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+class TestConnectionManager:
+
+    @pytest.mark.asyncio
+    async def test_failed_subscriber_is_dropped_and_closed(self):
+        """A subscriber whose send fails leaves the fanout and has its socket closed"""
+        manager = ConnectionManager()
+        healthy, broken = _FakeWebSocket(), _FakeWebSocket(fail=True)
+        await manager.connect_market_data(healthy, 'BTC-USDT')
+        await manager.connect_market_data(broken, 'BTC-USDT')
+
+        await manager.broadcast_market_data('BTC-USDT', {'type': 'bbo'})
+
+        assert manager.fanouts['BTC-USDT'].market_data == (healthy,)
+        assert len(healthy.sent) == 1 and healthy.close_code is None
+        assert broken.close_code == 1011
+
+    @pytest.mark.asyncio
+    async def test_coalesce_task_stops_without_subscribers(self):
+        """The order book coalescing task ends once the symbol has no subscribers"""
+        manager = ConnectionManager()
+        websocket = _FakeWebSocket()
+        await manager.connect_market_data(websocket, 'BTC-USDT')
+
+        manager.mark_order_book_dirty('BTC-USDT', OrderBook('BTC-USDT'))
+        fanout = manager.fanouts['BTC-USDT']
+        task = fanout.coalesce_task
+        await asyncio.sleep(0.05)
+        assert len(websocket.sent) == 1
+
+        manager.disconnect(websocket)
+        fanout.dirty_event.set()
+        await asyncio.wait_for(task, 1)
+        assert task.done()
+
+        # With no subscribers no new task is started
+        manager.mark_order_book_dirty('BTC-USDT', OrderBook('BTC-USDT'))
+        assert fanout.coalesce_task is task
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_coalesce_tasks(self):
+        """close() stops running coalescing tasks so none are left pending"""
+        manager = ConnectionManager()
+        await manager.connect_market_data(_FakeWebSocket(), 'BTC-USDT')
+        manager.mark_order_book_dirty('BTC-USDT', OrderBook('BTC-USDT'))
+        task = manager.fanouts['BTC-USDT'].coalesce_task
+
+        await manager.close()
+
+        assert task.cancelled()
+        assert manager.fanouts['BTC-USDT'].coalesce_task is None
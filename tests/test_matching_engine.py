@@ -4,6 +4,7 @@ from decimal import Decimal
 from src.core.matching_engine import MatchingEngine
 from src.core.order import Order, OrderSide, OrderType, OrderStatus
 from src.core.trade import Trade
+from src.core import matching_engine as matching_engine_module
 
 class TestMatchingEngine:
     
@@ -132,9 +133,9 @@ class TestMatchingEngine:
         asyncio.run(engine.submit_order(sample_orders['sell_limit']))
         
         bbo = engine.get_bbo('BTC-USDT')
-        assert bbo['best_bid'] == '50000.00'
-        assert bbo['best_ask'] == '50100.00'
-        assert bbo['spread'] == '100.00'
+        assert bbo['best_bid'] == '50000.00000000'
+        assert bbo['best_ask'] == '50100.00000000'
+        assert bbo['spread'] == '100.00000000'
     
     def test_order_book_depth(self, engine, sample_orders):
         """Test order book depth calculation"""
@@ -190,4 +191,62 @@ class TestMatchingEngine:
         assert len(trades) == 1
         assert trades[0]['price'] == '50000.00'
 
-        
\ No newline at end of file
+    @pytest.mark.asyncio
+    async def test_client_order_id_cannot_collide(self, engine, sample_orders):
+        """Client ids never replace a tracked order or a generated id"""
+        generated = await engine.submit_order(sample_orders['buy_limit'])
+        generated_id = generated['order']['order_id']
+
+        # reusing a generated id is rejected and leaves that order untouched
+        reused = dict(sample_orders['sell_limit'], order_id=generated_id)
+        result = await engine.submit_order(reused)
+        assert result['status'] == 'error'
+        assert engine.get_order_status(generated_id)['order']['side'] == 'BUY'
+
+        # a client id shaped like a bare counter id stays distinct from the
+        # engine's generated ids
+        custom = await engine.submit_order(dict(sample_orders['sell_limit'], order_id='O3'))
+        assert custom['status'] == 'success'
+        for _ in range(3):
+            later = await engine.submit_order(sample_orders['buy_limit'])
+            assert later['order']['order_id'] != 'O3'
+        assert engine.get_order_status('O3')['order']['side'] == 'SELL'
+
+        # a second order with the same client id is rejected
+        duplicate = await engine.submit_order(dict(sample_orders['buy_limit'], order_id='O3'))
+        assert duplicate['status'] == 'error'
+
+    @pytest.mark.asyncio
+    async def test_closed_orders_evicted_at_maxlen(self, engine, sample_orders, monkeypatch):
+        """Closed orders are kept up to CLOSED_ORDERS_MAXLEN, oldest evicted first"""
+        monkeypatch.setattr(matching_engine_module, 'CLOSED_ORDERS_MAXLEN', 3)
+
+        ids = []
+        for _ in range(3):
+            result = await engine.submit_order(sample_orders['buy_limit'])
+            ids.append(result['order']['order_id'])
+            await engine.cancel_order(ids[-1])
+
+        # exactly at the limit nothing is evicted
+        assert list(engine.closed_orders) == ids
+        assert engine.get_order_status(ids[0])['order']['status'] == 'cancelled'
+
+        # one more closed order pushes out the oldest
+        result = await engine.submit_order(sample_orders['buy_limit'])
+        ids.append(result['order']['order_id'])
+        await engine.cancel_order(ids[-1])
+
+        assert list(engine.closed_orders) == ids[1:]
+        assert engine.get_order_status(ids[0])['status'] == 'error'
+        assert not engine.open_orders
+
+    @pytest.mark.asyncio
+    async def test_filled_orders_move_to_closed(self, engine, sample_orders):
+        maker = await engine.submit_order(sample_orders['sell_limit'])
+        taker = await engine.submit_order(dict(sample_orders['buy_limit'], price='50100.00'))
+
+        assert taker['order']['status'] == 'filled'
+        assert taker['trades'][0]['price'] == '50100.00000000'
+        assert not engine.open_orders
+        assert set(engine.closed_orders) == {maker['order']['order_id'], taker['order']['order_id']}
+        assert engine.get_order_status(maker['order']['order_id'])['order']['status'] == 'filled'
@@ -0,0 +1,95 @@
+import pytest
+from decimal import Decimal, InvalidOperation
+from src.core.order import (
+    Order, OrderSide, OrderType, OrderStatus, PRICE_SCALE,
+    to_ticks, from_ticks, format_ticks
+)
+
+class TestTicks:
+
+    @pytest.mark.parametrize('value, ticks', [
+        (1, PRICE_SCALE),
+        (0.1, 10_000_000),
+        (50000.12345678, 5_000_012_345_678),
+        ('0.00000001', 1),
+        (Decimal('49999.99'), 4_999_999_000_000),
+        ('-2.5', -250_000_000),
+    ])
+    def test_to_ticks(self, value, ticks):
+        """Ints, floats, strings and Decimals convert to the same integer ticks"""
+        assert to_ticks(value) == ticks
+
+    @pytest.mark.parametrize('value', [
+        '50000.12345678', '0.00000001', '1', '-2.5', '123456789.87654321'
+    ])
+    def test_round_trip(self, value):
+        """Ticks convert back to the same Decimal and fixed 8-place string"""
+        ticks = to_ticks(value)
+        assert from_ticks(ticks) == Decimal(value)
+        assert format_ticks(ticks) == f"{Decimal(value):.8f}"
+
+    def test_large_float_takes_exact_path(self):
+        """Floats past the fast-path range still convert exactly"""
+        assert to_ticks(1e9) == 10**9 * PRICE_SCALE
+
+    @pytest.mark.parametrize('value', [
+        '0.000000001', 0.123456789, Decimal('1E-9'), 'NaN', 'Infinity', float('inf')
+    ])
+    def test_rejects_unrepresentable(self, value):
+        """More than 8 decimal places, NaN and infinity are rejected"""
+        with pytest.raises(ValueError):
+            to_ticks(value)
+
+    def test_rejects_malformed_string(self):
+        with pytest.raises(InvalidOperation):
+            to_ticks('abc')
+
+    def test_format_ticks(self):
+        assert format_ticks(0) == '0.00000000'
+        assert format_ticks(-1) == '-0.00000001'
+        assert format_ticks(5_000_000_000_000) == '50000.00000000'
+
+class TestOrder:
+
+    def test_to_dict_formats_ticks(self):
+        order = Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, '1.5', '50000.25')
+        data = order.to_dict()
+        assert data['quantity'] == '1.50000000'
+        assert data['price'] == '50000.25000000'
+        assert data['filled_quantity'] == '0.00000000'
+        assert data['remaining_quantity'] == '1.50000000'
+        assert data['type'] == 'LIMIT'
+        assert data['side'] == 'BUY'
+
+    def test_status_strings(self):
+        """to_dict reports each status as its lowercase API string"""
+        order = Order('BTC-USDT', OrderType.LIMIT, OrderSide.SELL, 2, 100)
+        assert order.to_dict()['status'] == 'pending'
+
+        order.fill_ticks(PRICE_SCALE, 100 * PRICE_SCALE)
+        assert order.status is OrderStatus.PARTIALLY_FILLED
+        assert order.to_dict()['status'] == 'partially_filled'
+
+        order.fill_ticks(PRICE_SCALE, 100 * PRICE_SCALE)
+        assert order.status is OrderStatus.FILLED
+        assert order.to_dict()['status'] == 'filled'
+        assert order.to_dict()['remaining_quantity'] == '0.00000000'
+
+        cancelled = Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, 1, 100)
+        cancelled.cancel()
+        assert cancelled.to_dict()['status'] == 'cancelled'
+
+    def test_terminal_orders_cannot_cancel(self):
+        order = Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, 1, 100)
+        order.fill_ticks(PRICE_SCALE, 100 * PRICE_SCALE)
+        with pytest.raises(ValueError):
+            order.cancel()
+
+    def test_overfill_rejected(self):
+        order = Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, 1, 100)
+        with pytest.raises(ValueError):
+            order.fill_ticks(PRICE_SCALE + 1, 100 * PRICE_SCALE)
+
+    def test_rejects_excess_precision(self):
+        with pytest.raises(ValueError):
+            Order('BTC-USDT', OrderType.LIMIT, OrderSide.BUY, '0.000000001', 100)
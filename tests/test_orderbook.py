@@ -0,0 +1,161 @@
+import pytest
+from src.core.orderbook import OrderBook
+from src.core.order import Order, OrderSide, OrderType, OrderStatus, PRICE_SCALE
+
+def limit(side, quantity, price):
+    return Order('BTC-USDT', OrderType.LIMIT, side, quantity, price)
+
+def level_orders(level):
+    """Walk a price level's linked list head to tail, checking the back links"""
+    orders, prev, order = [], None, level.head
+    while order is not None:
+        assert order._prev is prev
+        orders.append(order)
+        prev, order = order, order._next
+    assert level.tail is prev
+    assert level.count == len(orders)
+    assert level.total_quantity == sum(o.remaining_ticks for o in orders)
+    return orders
+
+class TestOrderBook:
+
+    @pytest.fixture
+    def book(self):
+        return OrderBook('BTC-USDT')
+
+    def test_sweep_several_levels(self, book):
+        """A marketable order walks levels best-first and leaves BBO and depth consistent"""
+        for price in (100, 101, 102, 103):
+            book.add_order(limit(OrderSide.SELL, 1, price))
+        book.add_order(limit(OrderSide.BUY, 1, 99))
+
+        taker = limit(OrderSide.BUY, '2.5', 102)
+        trades = book.add_order(taker)
+
+        assert [t.price_ticks for t in trades] == [100 * PRICE_SCALE, 101 * PRICE_SCALE, 102 * PRICE_SCALE]
+        assert [t.quantity_ticks for t in trades] == [PRICE_SCALE, PRICE_SCALE, PRICE_SCALE // 2]
+        assert taker.status is OrderStatus.FILLED
+
+        # swept levels are gone from the dict and the sorted index
+        assert list(book.ask_prices) == [102 * PRICE_SCALE, 103 * PRICE_SCALE]
+        assert set(book.ask_levels) == {102 * PRICE_SCALE, 103 * PRICE_SCALE}
+        assert book.get_bbo() == (99 * PRICE_SCALE, 102 * PRICE_SCALE)
+        assert book.get_spread() == 3 * PRICE_SCALE
+
+        depth = book.get_depth(5)
+        assert depth['bids'] == [['99.00000000', '1.00000000']]
+        assert depth['asks'] == [['102.00000000', '0.50000000'], ['103.00000000', '1.00000000']]
+
+    def test_sweep_empties_side(self, book):
+        """A market order that takes every level clears the opposing best price"""
+        book.add_order(limit(OrderSide.BUY, 1, 100))
+        book.add_order(limit(OrderSide.BUY, 1, 99))
+
+        taker = Order('BTC-USDT', OrderType.MARKET, OrderSide.SELL, 5)
+        trades = book.add_order(taker)
+
+        assert [t.price_ticks for t in trades] == [100 * PRICE_SCALE, 99 * PRICE_SCALE]
+        assert book.get_bbo() == (None, None)
+        assert not book.bid_levels and not book.bid_prices
+        assert book.get_depth()['bids'] == []
+        # a market order never rests
+        assert taker.remaining_ticks == 3 * PRICE_SCALE
+        assert not book.ask_levels
+
+    def test_limit_stops_at_its_price(self, book):
+        book.add_order(limit(OrderSide.SELL, 1, 100))
+        book.add_order(limit(OrderSide.SELL, 1, 105))
+
+        taker = limit(OrderSide.BUY, 3, 101)
+        trades = book.add_order(taker)
+
+        assert len(trades) == 1
+        # the rest of the order rests as the new best bid
+        assert book.get_bbo() == (101 * PRICE_SCALE, 105 * PRICE_SCALE)
+        assert book.orders[taker.order_id] is taker
+
+    def test_time_priority_within_level(self, book):
+        first = limit(OrderSide.SELL, 1, 100)
+        second = limit(OrderSide.SELL, 1, 100)
+        book.add_order(first)
+        book.add_order(second)
+
+        trades = book.add_order(limit(OrderSide.BUY, 1, 100))
+
+        assert trades[0].maker_order_id == first.order_id
+        assert level_orders(book.ask_levels[100 * PRICE_SCALE]) == [second]
+
+    @pytest.mark.parametrize('position', [0, 1, 2])
+    def test_cancel_in_level(self, book, position):
+        """Cancelling the head, a middle or the tail order relinks the rest"""
+        orders = [limit(OrderSide.BUY, n + 1, 100) for n in range(3)]
+        for order in orders:
+            book.add_order(order)
+
+        target = orders[position]
+        assert book.cancel_order(target.order_id)
+        assert target.status is OrderStatus.CANCELLED
+        assert target.order_id not in book.orders
+
+        remaining = [o for o in orders if o is not target]
+        assert level_orders(book.bid_levels[100 * PRICE_SCALE]) == remaining
+
+        # cancelling again finds nothing
+        assert not book.cancel_order(target.order_id)
+
+        # the remaining orders still match in time order
+        trades = book.add_order(Order('BTC-USDT', OrderType.MARKET, OrderSide.SELL, 10))
+        assert [t.maker_order_id for t in trades] == [o.order_id for o in remaining]
+
+    def test_cancel_last_order_removes_level(self, book):
+        best = limit(OrderSide.SELL, 1, 100)
+        book.add_order(best)
+        book.add_order(limit(OrderSide.SELL, 1, 101))
+
+        assert book.cancel_order(best.order_id)
+
+        assert 100 * PRICE_SCALE not in book.ask_levels
+        assert list(book.ask_prices) == [101 * PRICE_SCALE]
+        assert book.get_best_ask() == 101 * PRICE_SCALE
+
+    def test_filled_and_unrested_orders_not_tracked(self, book):
+        maker = limit(OrderSide.SELL, 1, 100)
+        book.add_order(maker)
+        ioc = Order('BTC-USDT', OrderType.IOC, OrderSide.BUY, 2, 100)
+        book.add_order(ioc)
+
+        assert ioc.status is OrderStatus.CANCELLED
+        assert book.orders == {}
+        assert not book.cancel_order(maker.order_id)
+
+    def test_depth_cache_invalidation(self, book):
+        """Cached depth is rebuilt after an order rests, matches or is cancelled"""
+        assert book.get_depth()['bids'] == []
+
+        # rest
+        resting = limit(OrderSide.BUY, 2, 100)
+        book.add_order(resting)
+        assert book.get_depth()['bids'] == [['100.00000000', '2.00000000']]
+
+        # an unchanged book serves the same cached lists
+        assert book.get_depth()['bids'] is book.get_depth()['bids']
+
+        # match
+        book.add_order(limit(OrderSide.SELL, '0.5', 100))
+        assert book.get_depth()['bids'] == [['100.00000000', '1.50000000']]
+        assert book.get_depth()['asks'] == []
+
+        # cancel
+        book.cancel_order(resting.order_id)
+        assert book.get_depth()['bids'] == []
+
+    def test_depth_cache_per_level_count(self, book):
+        for price in (100, 99, 98):
+            book.add_order(limit(OrderSide.BUY, 1, price))
+
+        assert len(book.get_depth(2)['bids']) == 2
+        assert len(book.get_depth(10)['bids']) == 3
+
+        book.add_order(limit(OrderSide.BUY, 1, 101))
+        assert book.get_depth(2)['bids'][0][0] == '101.00000000'
+        assert len(book.get_depth(10)['bids']) == 4